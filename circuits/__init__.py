@@ -18,8 +18,9 @@ except ImportError:
     __version__ = "unknown"
 
 from .core import (
-    BaseComponent, Bridge, Component, Debugger, Event, Loader, Manager,
-    TimeoutError, Timer, Worker, handler, ipc, reprhandler, sleep, task,
+    BaseComponent, Bridge, Component, Debugger, Event, FlightRecorder, Loader,
+    Manager, Shards, TimeoutError, Timer, Watchdog, Worker, handler, ipc,
+    reprhandler, shard, sleep, task,
 )
 
 # See http://peak.telecommunity.com/DevCenter/setuptools#namespace-packages
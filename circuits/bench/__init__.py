@@ -0,0 +1,198 @@
+"""Benchmarks
+
+A suite of benchmark scenarios for circuits, run with::
+
+    python -m circuits.bench [options] [scenario ...]
+
+Each scenario is run for a fixed number of samples after a few warm-up
+runs. Its rate (operations per second) and latency percentiles are
+printed and can be written as JSON with ``-o``. A file written earlier
+can be passed with ``-b`` to compare with, the exit status is 1 if a
+scenario has become slower than that baseline.
+"""
+from __future__ import print_function
+
+import json
+import platform
+import sys
+from optparse import OptionParser
+from time import time
+
+from circuits import __version__
+
+from . import core, net
+from .base import Scenario, measure
+
+USAGE = "%prog [options] [scenario ...]"
+VERSION = "%prog v" + __version__
+
+SCENARIOS = core.SCENARIOS + net.SCENARIOS
+
+TOLERANCE = 0.1  # Fraction a scenario may be slower than its baseline
+
+
+def scenarios(names=None):
+    """Return the scenarios named *names*, all if None"""
+
+    if not names:
+        return SCENARIOS
+
+    by_name = dict((scenario.name, scenario) for scenario in SCENARIOS)
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise ValueError("Unknown scenarios: %s" % ", ".join(unknown))
+
+    return tuple(by_name[name] for name in names)
+
+
+def run(names=None, samples=None, report=None):
+    """Run the scenarios named *names* (all if None) and return a dict
+    with the results
+
+    The result has the keys ``"time"``, ``"python"``, ``"platform"``,
+    ``"version"`` (of circuits) and ``"results"``, a list of the results
+    returned by :func:`~.base.measure`. *report* is called with each
+    result as soon as it is available.
+    """
+
+    results = []
+    for scenario in scenarios(names):
+        result = measure(scenario, samples)
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    return {
+        "time": time(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "version": __version__,
+        "results": results,
+    }
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Compare *results* with *baseline*, both as returned by :func:`run`
+
+    :returns: a list of ``(name, metric, value, baseline)`` tuples of
+        the scenarios whose rate is lower or whose p99 latency is higher
+        than in the baseline by more than *tolerance* (a fraction).
+    """
+
+    baselines = dict(
+        (result["name"], result) for result in baseline["results"]
+        if "error" not in result
+    )
+
+    regressions = []
+    for result in results["results"]:
+        base = baselines.get(result["name"])
+        if base is None or "error" in result:
+            continue
+
+        if result["rate"] < base["rate"] * (1 - tolerance):
+            regressions.append(
+                (result["name"], "rate", result["rate"], base["rate"])
+            )
+
+        p99, base_p99 = result["latency"]["p99"], base["latency"]["p99"]
+        if p99 > base_p99 * (1 + tolerance):
+            regressions.append((result["name"], "p99", p99, base_p99))
+
+    return regressions
+
+
+def _print(result):
+    if "error" in result:
+        print("%-10s %s" % (result["name"], result["error"]))
+        return
+
+    latency = result["latency"]
+    print("%-10s %12.1f/s %10.1f us (p50) %10.1f us (p99) %10.1f us (max)" % (
+        result["name"], result["rate"], latency["p50"] * 1e6,
+        latency["p99"] * 1e6, latency["max"] * 1e6))
+
+
+def parse_options():
+    parser = OptionParser(usage=USAGE, version=VERSION)
+
+    parser.add_option(
+        "-l", "--list",
+        action="store_true", default=False, dest="list",
+        help="List the scenarios and exit"
+    )
+
+    parser.add_option(
+        "-n", "--samples",
+        action="store", type="int", default=None, dest="samples",
+        help="Number of timed runs of each scenario"
+    )
+
+    parser.add_option(
+        "-o", "--output",
+        action="store", default=None, dest="output",
+        help="Write the results as JSON to OUTPUT (- for stdout)"
+    )
+
+    parser.add_option(
+        "-b", "--baseline",
+        action="store", default=None, dest="baseline",
+        help="Compare with the results written to BASELINE"
+    )
+
+    parser.add_option(
+        "-t", "--tolerance",
+        action="store", type="float", default=TOLERANCE, dest="tolerance",
+        help="Fraction a scenario may be slower than its baseline"
+    )
+
+    parser.add_option(
+        "-q", "--quiet",
+        action="store_false", default=True, dest="verbose",
+        help="Suppress output"
+    )
+
+    return parser.parse_args()
+
+
+def main():
+    opts, args = parse_options()
+
+    if opts.list:
+        for scenario in SCENARIOS:
+            doc = " ".join((scenario.__doc__ or "").split())
+            print("%-10s %s" % (scenario.name, doc))
+        return
+
+    try:
+        selected = scenarios(args)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        raise SystemExit(2)
+
+    verbose = opts.verbose and opts.output != "-"
+    results = run(
+        [scenario.name for scenario in selected], opts.samples,
+        _print if verbose else None
+    )
+
+    if opts.output == "-":
+        print(json.dumps(results, indent=2, sort_keys=True))
+    elif opts.output:
+        with open(opts.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if opts.baseline:
+        with open(opts.baseline) as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, opts.tolerance)
+        for name, metric, value, base in regressions:
+            print("%s: %s %g (baseline %g)" % (name, metric, value, base),
+                  file=sys.stderr)
+        if regressions:
+            raise SystemExit(1)
+
+
+__all__ = ("Scenario", "SCENARIOS", "measure", "run", "compare", "main")
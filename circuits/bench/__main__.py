@@ -0,0 +1,3 @@
+from circuits.bench import main
+
+main()
@@ -0,0 +1,158 @@
+"""Scenarios
+
+This module defines the :class:`Scenario` base class of the benchmark
+scenarios and :func:`measure`, which runs them.
+"""
+import gc
+from threading import Event as Flag
+from time import sleep
+
+from circuits.core.profiler import Histogram, clock
+
+TIMEOUT = 30.0  # Seconds to wait for a running manager
+
+LATENCIES = ("mean", "p50", "p90", "p99", "max")
+
+
+class Scenario(object):
+
+    """A benchmark scenario
+
+    :meth:`setup` builds the component tree, each call of :meth:`run`
+    performs some operations and returns their number, and
+    :meth:`teardown` cleans up.
+
+    The latency of an operation is the duration of :meth:`run` divided
+    by the number of operations, unless :meth:`run` appends the
+    latencies of the operations (in seconds) to :attr:`latencies`.
+
+    :cvar samples: number of timed runs.
+    :cvar warmup: number of runs before the timed ones.
+    """
+
+    name = None
+    samples = 100
+    warmup = 10
+
+    def __init__(self):
+        self.latencies = []
+
+    def setup(self):
+        pass
+
+    def run(self):
+        raise NotImplementedError()
+
+    def teardown(self):
+        pass
+
+
+class Countdown(object):
+
+    """Wait in one thread for a number of operations done in another"""
+
+    def __init__(self):
+        self._flag = Flag()
+        self._count = 0
+
+    def expect(self, n):
+        self._count = n
+        self._flag.clear()
+
+    def done(self, n=1):
+        self._count -= n
+        if self._count <= 0:
+            self._flag.set()
+
+    def wait(self):
+        if not self._flag.wait(TIMEOUT):
+            raise RuntimeError("Timed out after %0.1fs" % TIMEOUT)
+
+
+def flush(manager):
+    """Flush *manager* until its queue is empty"""
+
+    while len(manager):
+        manager.flush()
+
+
+def wait_for(predicate):
+    """Wait until *predicate()* returns True"""
+
+    for _ in range(int(TIMEOUT / 0.01)):
+        if predicate():
+            return
+        sleep(0.01)
+
+    raise RuntimeError("Timed out after %0.1fs" % TIMEOUT)
+
+
+def start(manager):
+    """Start *manager* in a thread and wait until it is idle"""
+
+    manager.start()
+    wait_for(lambda: manager.running and not len(manager))
+
+
+def stop(manager):
+    if manager.running:
+        manager.stop()
+        manager.join()
+
+
+def measure(scenario, samples=None):
+    """Run *scenario*, a :class:`Scenario` subclass, and return a dict
+    with its results
+
+    The result has the keys ``"name"``, ``"ops"`` (the number of
+    operations timed), ``"seconds"`` (the time they took), ``"rate"``
+    (operations per second) and ``"latency"`` (a dict of ``"mean"``,
+    ``"p50"``, ``"p90"``, ``"p99"`` and ``"max"`` latencies in seconds).
+    If the scenario can't be set up, e.g. because a module it needs
+    isn't available, the result has an ``"error"`` key instead.
+    """
+
+    instance = scenario()
+    samples = samples or scenario.samples
+
+    try:
+        instance.setup()
+    except Exception as e:
+        instance.teardown()
+        return {
+            "name": scenario.name,
+            "error": "%s: %s" % (type(e).__name__, e),
+        }
+
+    histogram = Histogram()
+    ops = seconds = 0
+    try:
+        for _ in range(scenario.warmup):
+            instance.run()
+        del instance.latencies[:]
+
+        gc.collect()
+        for _ in range(samples):
+            start = clock()
+            n = instance.run()
+            elapsed = clock() - start
+
+            ops += n
+            seconds += elapsed
+            if not instance.latencies:
+                histogram.record(int(elapsed / n * 1e9))
+
+        for latency in instance.latencies:
+            histogram.record(int(latency * 1e9))
+    finally:
+        instance.teardown()
+
+    summary = histogram.snapshot(1e-9)
+
+    return {
+        "name": scenario.name,
+        "ops": ops,
+        "seconds": seconds,
+        "rate": ops / seconds if seconds else 0.0,
+        "latency": dict((key, summary[key]) for key in LATENCIES),
+    }
@@ -0,0 +1,387 @@
+"""Core Scenarios
+
+Benchmarks of the event loop: firing and dispatching events, calls
+and waits, timers, suspended handlers, threads and workers.
+"""
+from threading import Thread
+
+from circuits import Component, Event, Manager, Worker, sleep, task
+from circuits.core.profiler import clock
+
+from .base import Countdown, Scenario, flush, start, stop
+
+
+class hello(Event):
+    """hello Event"""
+
+
+class leaf(Event):
+    """leaf Event"""
+
+
+class ping(Event):
+    """ping Event"""
+
+
+class pong(Event):
+    """pong Event"""
+
+
+class calls(Event):
+    """calls Event"""
+
+
+class sleeper(Event):
+    """sleeper Event"""
+
+
+class flood(Event):
+    """flood Event"""
+
+
+class noise(Event):
+    """noise Event"""
+
+
+def echo(data):
+    return data
+
+
+class Receiver(Component):
+
+    def hello(self):
+        pass
+
+
+class Leaf(Component):
+
+    def leaf(self):
+        pass
+
+
+class Connection(Component):
+
+    def leaf(self):
+        self.unregister()
+
+
+class Fire(Scenario):
+
+    """Fire events handled by a single handler and flush them"""
+
+    name = "fire"
+    events = 1000
+
+    def setup(self):
+        self.manager = Manager() + Receiver()
+        flush(self.manager)
+
+    def run(self):
+        fire = self.manager.fire
+        for _ in range(self.events):
+            fire(hello())
+        flush(self.manager)
+        return self.events
+
+
+class Create(Fire):
+
+    """Like fire, but with events created by Event.create()"""
+
+    name = "create"
+
+    def run(self):
+        fire, create = self.manager.fire, Event.create
+        for _ in range(self.events):
+            fire(create("hello"))
+        flush(self.manager)
+        return self.events
+
+
+class Fanout(Scenario):
+
+    """Fire events handled by 100 components each"""
+
+    name = "fanout"
+    components = 100
+    events = 100
+
+    def setup(self):
+        self.manager = Manager()
+        for _ in range(self.components):
+            Leaf().register(self.manager)
+        flush(self.manager)
+
+    def run(self):
+        fire = self.manager.fire
+        for _ in range(self.events):
+            fire(leaf())
+        flush(self.manager)
+        return self.events
+
+
+class Caller(Component):
+
+    def calls(self, n, latencies):
+        for _ in range(n):
+            started = clock()
+            yield self.call(pong())
+            latencies.append(clock() - started)
+
+    def pong(self):
+        return "pong"
+
+
+class Call(Scenario):
+
+    """Round trips of a generator handler waiting for another
+    handler with yield self.call()"""
+
+    name = "call"
+    calls = 100
+
+    def setup(self):
+        self.manager = Manager() + Caller()
+        flush(self.manager)
+
+    def run(self):
+        latencies = self.latencies
+        expected = len(latencies) + self.calls
+
+        self.manager.fire(calls(self.calls, latencies))
+        while len(latencies) < expected:
+            self.manager.tick()
+
+        return self.calls
+
+
+class Tree(Scenario):
+
+    """Register a component in a tree of 1000 components, send it an
+    event and unregister it again, like the components created for
+    connections"""
+
+    name = "tree"
+    components = 1000
+    connections = 100
+
+    def setup(self):
+        self.manager = Manager()
+        for i in range(self.components):
+            Leaf(channel="leaf-%d" % i).register(self.manager)
+        flush(self.manager)
+
+    def run(self):
+        manager = self.manager
+        for i in range(self.connections):
+            channel = "connection-%d" % i
+            Connection(channel=channel).register(manager)
+            manager.fire(leaf(), channel)
+        flush(manager)
+        return self.connections
+
+
+class Timers(Scenario):
+
+    """Schedule and run callbacks with 100000 idle timers pending"""
+
+    name = "timers"
+    idle = 100000
+    timers = 1000
+
+    def setup(self):
+        self.manager = Manager()
+        self.expired = 0
+        for i in range(self.idle):
+            self.manager.callLater(3600 + i, self._expire)
+
+    def _expire(self):
+        self.expired += 1
+
+    def run(self):
+        manager = self.manager
+        expected = self.expired + self.timers
+        for _ in range(self.timers):
+            manager.callLater(0, self._expire)
+        while self.expired < expected:
+            manager.tick()
+        return self.timers
+
+
+class Sleeper(Receiver):
+
+    def sleeper(self):
+        yield sleep(3600)
+
+
+class Sleep(Fire):
+
+    """Like fire, but with 10000 handlers suspended by yield sleep()"""
+
+    name = "sleep"
+    tasks = 10000
+
+    def setup(self):
+        self.manager = Manager() + Sleeper()
+        for _ in range(self.tasks):
+            self.manager.fire(sleeper())
+        flush(self.manager)
+        self.manager.tick()
+
+    def run(self):
+        fire = self.manager.fire
+        for _ in range(self.events):
+            fire(hello())
+        self.manager.tick()
+        return self.events
+
+
+class Counter(Component):
+
+    def init(self, countdown):
+        self.countdown = countdown
+
+    def hello(self):
+        self.countdown.done()
+
+
+class Threads(Scenario):
+
+    """Fire events from 4 threads into a running manager"""
+
+    name = "threads"
+    samples = 20
+    warmup = 2
+    threads = 4
+    events = 2500
+
+    def setup(self):
+        self.countdown = Countdown()
+        self.manager = Manager() + Counter(self.countdown)
+        start(self.manager)
+
+    def _produce(self):
+        fire = self.manager.fire
+        for _ in range(self.events):
+            fire(hello())
+
+    def run(self):
+        self.countdown.expect(self.threads * self.events)
+        threads = [
+            Thread(target=self._produce) for _ in range(self.threads)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.countdown.wait()
+        return self.threads * self.events
+
+    def teardown(self):
+        stop(self.manager)
+
+
+class Tasks(Component):
+
+    def init(self, countdown, payload):
+        self.countdown = countdown
+        self.payload = payload
+
+    def calls(self, n, latencies):
+        for _ in range(n):
+            started = clock()
+            yield self.call(task(echo, self.payload), "worker")
+            latencies.append(clock() - started)
+        self.countdown.done()
+
+
+class Workers(Scenario):
+
+    """Round trips of 64 KiB tasks to a process worker"""
+
+    name = "worker"
+    samples = 20
+    warmup = 2
+    tasks = 10
+    payload = 64 * 1024
+
+    def setup(self):
+        self.countdown = Countdown()
+        self.manager = Manager() + Tasks(self.countdown, b"\0" * self.payload)
+        Worker(process=True, workers=1).register(self.manager)
+        start(self.manager)
+
+    def run(self):
+        self.countdown.expect(1)
+        self.manager.fire(calls(self.tasks, self.latencies))
+        self.countdown.wait()
+        return self.tasks
+
+    def teardown(self):
+        stop(self.manager)
+
+
+class Noisy(Component):
+
+    channel = "noisy"
+
+    def init(self, burst):
+        self.burst = burst
+
+    def flood(self):
+        for _ in range(self.burst):
+            self.fire(noise())
+        if self.root.running:
+            self.fire(flood())
+
+    def noise(self):
+        pass
+
+
+class Quiet(Component):
+
+    channel = "quiet"
+
+    def init(self, countdown, latencies):
+        self.countdown = countdown
+        self.latencies = latencies
+
+    def ping(self, started):
+        self.latencies.append(clock() - started)
+        self.countdown.done()
+
+
+class Fair(Scenario):
+
+    """Latency of events fired into a manager with fair scheduling
+    while another channel is flooded with bursts of 1000 events"""
+
+    name = "fair"
+    samples = 20
+    warmup = 2
+    burst = 1000
+    pings = 10
+
+    def setup(self):
+        self.countdown = Countdown()
+        self.manager = Manager()
+        self.manager.useFairQueue()
+        Quiet(self.countdown, self.latencies).register(self.manager)
+        Noisy(self.burst).register(self.manager)
+        start(self.manager)
+        self.manager.fire(flood(), "noisy")
+
+    def run(self):
+        self.countdown.expect(self.pings)
+        for _ in range(self.pings):
+            self.manager.fire(ping(clock()), "quiet")
+        self.countdown.wait()
+        return self.pings
+
+    def teardown(self):
+        stop(self.manager)
+
+
+SCENARIOS = (
+    Fire, Create, Fanout, Call, Tree, Timers, Sleep, Threads, Workers, Fair,
+)
@@ -0,0 +1,260 @@
+"""Networking Scenarios
+
+Benchmarks of round trips over loopback connections: TCP echo, HTTP
+keep-alive requests, WebSocket messages and node RPC. The clients are
+blocking sockets (or, for node RPC, a node in the same manager) and
+the servers run in a manager started in a thread.
+"""
+from base64 import b64encode
+from os import urandom
+from socket import IPPROTO_TCP, TCP_NODELAY, create_connection
+from struct import pack, unpack
+
+from circuits import Component, Event, Manager
+from circuits.core.profiler import clock
+from circuits.net.events import write
+from circuits.net.sockets import TCPServer
+from circuits.node import Node, remote
+
+from .base import Countdown, Scenario, start, stop, wait_for
+
+MESSAGE = b"x" * 64
+
+
+def connect(host, port):
+    sock = create_connection((host, port))
+    sock.setsockopt(IPPROTO_TCP, TCP_NODELAY, 1)
+    return sock
+
+
+class Client(object):
+
+    """A blocking client reading from a buffered socket"""
+
+    def __init__(self, host, port):
+        self.sock = connect(host, port)
+        self.buffer = b""
+
+    def read(self, n):
+        while len(self.buffer) < n:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError("Connection closed")
+            self.buffer += data
+        data, self.buffer = self.buffer[:n], self.buffer[n:]
+        return data
+
+    def readuntil(self, delimiter):
+        while delimiter not in self.buffer:
+            data = self.sock.recv(65536)
+            if not data:
+                raise EOFError("Connection closed")
+            self.buffer += data
+        i = self.buffer.index(delimiter) + len(delimiter)
+        data, self.buffer = self.buffer[:i], self.buffer[i:]
+        return data
+
+    def close(self):
+        self.sock.close()
+
+
+class Roundtrips(Scenario):
+
+    """Base class of the scenarios timing round trips of a client
+
+    :meth:`roundtrip` performs one round trip.
+    """
+
+    samples = 20
+    warmup = 2
+    roundtrips = 100
+
+    manager = client = None
+
+    def run(self):
+        latencies = self.latencies
+        roundtrip = self.roundtrip
+        for _ in range(self.roundtrips):
+            started = clock()
+            roundtrip()
+            latencies.append(clock() - started)
+        return self.roundtrips
+
+    def roundtrip(self):
+        raise NotImplementedError()
+
+    def teardown(self):
+        if self.client is not None:
+            self.client.close()
+        if self.manager is not None:
+            stop(self.manager)
+
+
+class Echo(Component):
+
+    def read(self, sock, data):
+        self.fire(write(sock, data))
+
+
+class TCPEcho(Roundtrips):
+
+    """Round trips of 64 byte messages to a TCP echo server"""
+
+    name = "tcp"
+
+    def setup(self):
+        self.manager = Manager()
+        server = TCPServer(("127.0.0.1", 0), channel="echo")
+        server.register(self.manager)
+        Echo(channel="echo").register(self.manager)
+        start(self.manager)
+
+        self.client = Client(server.host, server.port)
+
+    def roundtrip(self):
+        self.client.sock.sendall(MESSAGE)
+        self.client.read(len(MESSAGE))
+
+
+class HTTP(Roundtrips):
+
+    """Requests sent over a keep-alive connection to a circuits.web
+    Server"""
+
+    name = "http"
+
+    REQUEST = b"GET / HTTP/1.1\r\nHost: localhost\r\n\r\n"
+
+    def setup(self):
+        from circuits.web import Controller, Server
+
+        class Root(Controller):
+
+            def index(self):
+                return "Hello World!"
+
+        self.manager = Manager()
+        server = Server(("127.0.0.1", 0)).register(self.manager)
+        Root().register(server)
+        start(self.manager)
+
+        self.client = Client(server.host, server.port)
+
+    def roundtrip(self):
+        client = self.client
+        client.sock.sendall(self.REQUEST)
+
+        headers = client.readuntil(b"\r\n\r\n").lower()
+        if not headers.startswith(b"http/1.1 200"):
+            raise ValueError("Unexpected response: %r" % headers)
+        i = headers.index(b"content-length:") + 15
+        client.read(int(headers[i:headers.index(b"\r\n", i)]))
+
+
+class WebSocketEcho(Component):
+
+    channel = "wsserver"
+
+    def read(self, sock, data):
+        self.fire(write(sock, data))
+
+
+class WebSocket(Roundtrips):
+
+    """Round trips of 64 byte text messages to a WebSocket echo server"""
+
+    name = "websocket"
+
+    def setup(self):
+        from circuits.web import Server
+        from circuits.web.websockets import WebSocketsDispatcher
+
+        self.manager = Manager()
+        server = Server(("127.0.0.1", 0)).register(self.manager)
+        WebSocketsDispatcher("/websocket").register(server)
+        WebSocketEcho().register(self.manager)
+        start(self.manager)
+
+        self.client = Client(server.host, server.port)
+        key = b64encode(urandom(16))
+        self.client.sock.sendall(
+            b"GET /websocket HTTP/1.1\r\n"
+            b"Host: localhost\r\n"
+            b"Upgrade: websocket\r\n"
+            b"Connection: Upgrade\r\n"
+            b"Sec-WebSocket-Key: " + key + b"\r\n"
+            b"Sec-WebSocket-Version: 13\r\n\r\n"
+        )
+        response = self.client.readuntil(b"\r\n\r\n")
+        if not response.startswith(b"HTTP/1.1 101"):
+            raise ValueError("Unexpected response: %r" % response)
+
+        # A masked text frame (the mask of zeros leaves the payload as is)
+        self.frame = pack("!BB", 0x81, 0x80 | len(MESSAGE)) + \
+            b"\0\0\0\0" + MESSAGE
+
+    def roundtrip(self):
+        client = self.client
+        client.sock.sendall(self.frame)
+
+        opcode, length = unpack("!BB", client.read(2))
+        if length == 126:
+            length = unpack("!H", client.read(2))[0]
+        elif length == 127:
+            length = unpack("!Q", client.read(8))[0]
+        client.read(length)
+
+
+class ping(Event):
+    """ping Event"""
+
+
+class pings(Event):
+    """pings Event"""
+
+
+class Peer(Component):
+
+    connected = False
+
+    def init(self, countdown):
+        self.countdown = countdown
+
+    def connected_to(self, *args):
+        self.connected = True
+
+    def pings(self, n, latencies):
+        for _ in range(n):
+            started = clock()
+            yield self.call(remote(ping(), "peer"))
+            latencies.append(clock() - started)
+        self.countdown.done()
+
+    def ping(self):
+        return "pong"
+
+
+class NodeRPC(Roundtrips):
+
+    """Round trips of remote events between two nodes"""
+
+    name = "node"
+
+    def setup(self):
+        self.countdown = Countdown()
+        self.manager = Manager()
+        peer = Peer(self.countdown).register(self.manager)
+        node = Node(port=0, server_ip="127.0.0.1").register(self.manager)
+        start(self.manager)
+
+        node.add("peer", node.server.host, node.server.port)
+        wait_for(lambda: peer.connected)
+
+    def run(self):
+        self.countdown.expect(1)
+        self.manager.fire(pings(self.roundtrips, self.latencies))
+        self.countdown.wait()
+        return self.roundtrips
+
+
+SCENARIOS = (TCPEcho, HTTP, WebSocket, NodeRPC)
@@ -9,13 +9,17 @@ from .events import Event
 from .handlers import handler, reprhandler
 from .loader import Loader
 from .manager import Manager, TimeoutError, sleep
+from .recorder import FlightRecorder
+from .shards import Shards, shard
 from .timers import Timer
 from .values import Value
+from .watchdog import Watchdog
 from .workers import Worker, task
 
 __all__ = (
     "handler", "BaseComponent", "Component", "Event", "task",
     "Worker", "ipc", "Bridge", "Debugger", "Timer", "Manager", "TimeoutError",
+    "Shards", "shard", "Watchdog", "FlightRecorder",
 )
 
 # flake8: noqa
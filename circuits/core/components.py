@@ -2,12 +2,14 @@
 This module defines the BaseComponent and its subclass Component.
 """
 from collections import Callable
-from inspect import getmembers
+from inspect import isfunction
 from itertools import chain
+from operator import itemgetter
 from types import MethodType
 
+from ..six import create_bound_method
 from .events import Event, registered, unregistered
-from .handlers import HandlerMetaClass, handler
+from .handlers import HandlerMetaClass, _own, handler
 from .manager import Manager
 
 
@@ -45,6 +47,63 @@ class prepare_unregister(Event):
             component = component.parent
 
 
+def _classMembers(cls):
+    """
+    Return the handlers and component attributes of the class *cls*.
+    They are looked up once per class and reused for all instances.
+
+    Handlers defined in the direct base classes are included even if
+    a method of the same name in *cls* hides them (unless it is a
+    handler declared with ``override=True``).
+    """
+
+    members = cls.__dict__.get("_class_members")
+    if members is not None:
+        return members
+
+    values = []
+    components = []
+
+    for k in dir(cls):
+        v = getattr(cls, k, None)
+        if getattr(v, "handler", False) is True:
+            values.append(v)
+        elif isinstance(v, BaseComponent):
+            components.append((k, v))
+
+    handlers = dict(
+        [(k, v) for k, v in list(cls.__dict__.items())
+            if getattr(v, "handler", False)]
+    )
+
+    def overridden(x):
+        return x in handlers and handlers[x].override
+
+    for base in cls.__bases__:
+        if issubclass(cls, base):
+            for k, v in list(base.__dict__.items()):
+                p1 = isinstance(v, Callable)
+                p2 = getattr(v, "handler", False)
+                p3 = overridden(k)
+                if p1 and p2 and not p3:
+                    values.append(v)
+
+    functions = []
+    methods = []
+    for v in values:
+        if getattr(v, "__self__", None) is not None:
+            # Already bound, e.g. a classmethod
+            methods.append(v)
+        else:
+            f = getattr(v, "__func__", v)
+            if f not in functions:
+                functions.append(f)
+
+    members = (tuple(functions), tuple(methods), tuple(components))
+    setattr(cls, "_class_members", members)
+    return members
+
+
 class BaseComponent(Manager):
 
     """
@@ -80,30 +139,6 @@ class BaseComponent(Manager):
 
     channel = "*"
 
-    def __new__(cls, *args, **kwargs):
-        self = super(BaseComponent, cls).__new__(cls)
-
-        handlers = dict(
-            [(k, v) for k, v in list(cls.__dict__.items())
-                if getattr(v, "handler", False)]
-        )
-
-        def overridden(x):
-            return x in handlers and handlers[x].override
-
-        for base in cls.__bases__:
-            if issubclass(cls, base):
-                for k, v in list(base.__dict__.items()):
-                    p1 = isinstance(v, Callable)
-                    p2 = getattr(v, "handler", False)
-                    p3 = overridden(k)
-                    if p1 and p2 and not p3:
-                        name = "%s_%s" % (base.__name__, k)
-                        method = MethodType(v, self)
-                        setattr(self, name, method)
-
-        return self
-
     def __init__(self, *args, **kwargs):
         "initializes x; see x.__class__.__doc__ for signature"
 
@@ -111,21 +146,36 @@ class BaseComponent(Manager):
 
         self.channel = kwargs.get("channel", self.channel) or "*"
 
-        for k, v in getmembers(self):
+        functions, methods, components = _classMembers(type(self))
+
+        members = dict(components)
+        for k, v in list(self.__dict__.items()):
             if getattr(v, "handler", False) is True:
-                self.addHandler(v)
-            # TODO: Document this feature. See Issue #88
-            if v is not self and isinstance(v, BaseComponent) \
-                    and v not in ('parent', 'root'):
+                methods = methods + (v,)
+            elif isinstance(v, BaseComponent):
+                members[k] = v
+
+        # Nothing has been dispatched by this component yet, there is
+        # no cache to update.
+        for f in functions:
+            self._storeHandler(MethodType(f, self))
+        for method in methods:
+            self._storeHandler(
+                create_bound_method(method, self)
+                if isfunction(method) else method
+            )
+
+        # TODO: Document this feature. See Issue #88
+        for k, v in sorted(members.items(), key=itemgetter(0)):
+            if v is not self:
                 v.register(self)
 
         if hasattr(self, "init") and isinstance(self.init, Callable):
             self.init(*args, **kwargs)
 
-        @handler("prepare_unregister_complete", channel=self)
-        def _on_prepare_unregister_complete(self, event, e, value):
-            self._do_prepare_unregister_complete(event.parent, value)
-        self.addHandler(_on_prepare_unregister_complete)
+    @handler("prepare_unregister_complete", channel=_own)
+    def _on_prepare_unregister_complete(self, event, e, value):
+        self._do_prepare_unregister_complete(event.parent, value)
 
     def register(self, parent):
         """
@@ -174,7 +224,6 @@ class BaseComponent(Manager):
 
         # tick shouldn't be called anymore, although component is still in tree
         self._unregister_pending = True
-        self.root._cache_needs_refresh = True
 
         # Give components a chance to prepare for unregister
         evt = prepare_unregister(self)
@@ -1,14 +1,54 @@
 """
 This module defines the basic event class and common events.
 """
+from collections import deque
 from inspect import ismethod
+from threading import Lock
 from traceback import format_tb
 
+EVENT_CLASSES_MAX = 4096
+"""Maximum number of event classes kept by :meth:`Event.create`."""
+
+_event_classes = {}
+_event_classes_order = deque()
+_event_classes_lock = Lock()
+
+
+def _eventclass(base, name):
+    """
+    Return the subclass of *base* named *name* that is used for events
+    created dynamically. Classes are created once and reused, so repeatedly
+    creating events with the same name doesn't create new class objects.
+    The registry is bounded by :data:`EVENT_CLASSES_MAX`, the oldest
+    classes are dropped first.
+    """
+
+    key = (base, name)
+    cls = _event_classes.get(key)
+    if cls is not None:
+        return cls
+
+    with _event_classes_lock:
+        cls = _event_classes.get(key)
+        if cls is None:
+            cls = type(base)(name, (base,), {})
+            if len(_event_classes_order) >= EVENT_CLASSES_MAX:
+                del _event_classes[_event_classes_order.popleft()]
+            _event_classes[key] = cls
+            _event_classes_order.append(key)
+
+    return cls
+
 
 class Event(object):
 
-    channels = ()
-    "The channels this message is sent to."
+    # The attributes every event has are kept in slots. Others, such as
+    # the ones set by the manager when tracking completion, end up in the
+    # instance's __dict__ which is only created when first used.
+    __slots__ = (
+        "args", "kwargs", "uid", "value", "handler", "stopped", "cancelled",
+        "name", "_channels", "__dict__", "__weakref__",
+    )
 
     parent = None
     notify = False
@@ -16,11 +56,13 @@ class Event(object):
     failure = False
     complete = False
     alert_done = False
+    forget = False
     waitingHandlers = 0
+    future = None
 
     @classmethod
     def create(cls, _name, *args, **kwargs):
-        return type(cls)(_name, (cls,), {})(*args, **kwargs)
+        return _eventclass(cls, _name)(*args, **kwargs)
 
     def child(self, name, *args, **kwargs):
         e = Event.create(
@@ -77,6 +119,12 @@ class Event(object):
             to same channels as the initially dispatched event itself.
             This may be overridden by specifying an alternative list of
             destinations using this attribute.
+
+        :var forget: if this optional attribute is set to ``True``, the
+            event is fired and forgotten. The results returned by its
+            handlers are discarded and its :attr:`value` is a shared
+            empty value that is always ``None``. Use it for frequent
+            events whose value is never looked at.
         """
 
         self.args = list(args)
@@ -90,13 +138,32 @@ class Event(object):
         if not hasattr(self, 'name'):
             self.name = self.__class__.__name__
 
+    @property
+    def channels(self):
+        "The channels this message is sent to."
+
+        try:
+            return self._channels
+        except AttributeError:
+            return ()
+
+    @channels.setter
+    def channels(self, channels):
+        self._channels = channels
+
     def __getstate__(self):
         odict = self.__dict__.copy()
+        for k in _slots:
+            if hasattr(self, k):
+                odict[k] = getattr(self, k)
         del odict["handler"]
+        odict.pop("future", None)
         return odict
 
     def __setstate__(self, dict):
-        self.__dict__.update(dict)
+        self.handler = None
+        for k, v in dict.items():
+            setattr(self, k, v)
 
     def __le__(self, other):
         return False
@@ -166,6 +233,9 @@ class Event(object):
         self.stopped = True
 
 
+_slots = tuple(k for k in Event.__slots__ if not k.startswith("__"))
+
+
 class exception(Event):
 
     """exception Event
@@ -271,6 +341,46 @@ class unregistered(Event):
     """
 
 
+class queue_high(Event):
+
+    """queue_high Event
+
+    This Event is sent when the number of events in the root manager's
+    queue reaches the high watermark, see
+    :meth:`~.manager.Manager.limitQueue`. Components producing events
+    from external sources, like sockets, should pause until they receive
+    a :class:`queue_low` event.
+
+    :param queued: The number of queued events.
+    :type  queued: int
+    """
+
+
+class queue_low(Event):
+
+    """queue_low Event
+
+    This Event is sent when the number of events in the root manager's
+    queue has fallen to the low watermark after a :class:`queue_high`
+    event.
+
+    :param queued: The number of queued events.
+    :type  queued: int
+    """
+
+
+class stats(Event):
+
+    """stats Event
+
+    This Event is sent periodically by a manager profiling its handlers,
+    see :meth:`~.manager.Manager.profile`.
+
+    :param snapshot: The statistics, see :meth:`~.profiler.Profiler.snapshot`.
+    :type  snapshot: dict
+    """
+
+
 class generate_events(Event):
 
     """generate_events Event
@@ -290,8 +400,18 @@ class generate_events(Event):
     Components that actually consume time waiting for events to be generated,
     thus suspending normal execution, must provide a method ``resume``
     that interrupts waiting for events.
+
+    Components that only need to check for events from time to time add
+    a source with :meth:`~.manager.Manager.addSource` instead, which is
+    called only when it is due. The event is still fired on all channels
+    in every iteration of the main loop, for the poller and the handlers
+    of the components that don't use sources.
     """
 
+    __slots__ = ("_time_left", "_lock")
+
+    forget = True
+
     def __init__(self, lock, max_wait):
         super(generate_events, self).__init__()
 
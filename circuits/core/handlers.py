@@ -5,6 +5,20 @@ from collections import Callable
 from circuits.tools import getargspec
 
 
+class _Own(object):
+
+    """
+    Channel of handlers that only receive the events sent to their own
+    component, i.e. events whose channel is the component itself.
+    """
+
+    def __repr__(self):
+        return "<own>"
+
+
+_own = _Own()
+
+
 def handler(*names, **kwargs):
     """Creates an Event Handler
 
@@ -59,6 +73,11 @@ def handler(*names, **kwargs):
     attribute. For the simplest scenario, there even is a utility
     method :meth:`circuits.core.manager.Manager.callEvent` that combines
     firing and waiting.
+
+    A task that yields a :class:`~circuits.core.manager.Future` is not
+    reexamined until the future is done. The future must be completed
+    by the manager's thread (e.g. from the handler of an event fired
+    by another thread).
     """
 
     def wrapper(f):
@@ -96,18 +115,20 @@ def reprhandler(handler):
     if channel is None:
         channel = "*"
 
-    from circuits.core.manager import Manager
-    if isinstance(channel, Manager):
-        channel = "<instance of " + channel.__class__.__name__ + ">"
-
-    names = ",".join(handler.names)
-
     instance = getattr(
         handler, "im_self", getattr(
             handler, "__self__", Unknown()
         )
     ).__class__.__name__
 
+    from circuits.core.manager import Manager
+    if isinstance(channel, Manager):
+        channel = "<instance of " + channel.__class__.__name__ + ">"
+    elif channel is _own:
+        channel = "<instance of " + instance + ">"
+
+    names = ",".join(handler.names)
+
     method = handler.__name__
 
     priority = "[%0.2f]" % (handler.priority,) if handler.priority else ""
@@ -2,8 +2,8 @@
 This module defines the Manager class.
 """
 import atexit
-from collections import deque
-from heapq import heappop, heappush
+from collections import OrderedDict, deque
+from heapq import heapify, heappop, heappush
 from inspect import isfunction
 from itertools import chain, count
 from multiprocessing import Process, current_process
@@ -11,28 +11,40 @@ from operator import attrgetter
 from os import getpid, kill
 from signal import SIGINT, SIGTERM, signal as set_signal_handler
 from sys import exc_info as _exc_info, stderr
-from threading import RLock, Thread, current_thread
+from threading import Condition, RLock, Thread, current_thread
 from time import time
 from traceback import format_exc
 from types import GeneratorType
 from uuid import uuid4 as uuid
 
-from ..six import Iterator, create_bound_method, next
+from ..six import Iterator, create_bound_method, next, reraise
 from ..tools import tryimport
-from .events import Event, exception, generate_events, signal, started, stopped
+from .events import (
+    Event, exception, generate_events, queue_high, queue_low, signal,
+    started, stats, stopped,
+)
 from .handlers import handler
-from .values import Value
+from .profiler import Profiler, clock
+from .values import Value, _null_value
 
 try:
     from signal import SIGKILL
 except ImportError:
     SIGKILL = SIGTERM
 
+try:
+    from inspect import iscoroutine
+except ImportError:
+    def iscoroutine(obj):
+        return False
+
 
 thread = tryimport(("thread", "_thread"))
 
 
 TIMEOUT = 0.1  # 100ms timeout when idle
+QUANTUM = 100  # Events per queue and flush with fair scheduling
+POLICIES = ("block", "drop_newest", "drop_oldest", "coalesce")
 
 
 class UnregistrableError(Exception):
@@ -60,6 +72,108 @@ class ExceptionWrapper(object):
         return self.exception
 
 
+class _Suspend(Iterator):
+
+    # Returned by __await__: suspends the awaiting coroutine once, handing
+    # *awaited* to the manager, and then returns the value of *result()*.
+
+    def __init__(self, awaited, result):
+        self._awaited = awaited
+        self._result = result
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+    def send(self, value):
+        if self._awaited is not None:
+            awaited, self._awaited = self._awaited, None
+            return awaited
+        raise StopIteration(self._result())
+
+
+class Future(object):
+
+    """
+    The result of something that completes later, e.g. the processing
+    of an event. Coroutine handlers (``async def``) can ``await`` it.
+    """
+
+    def __init__(self):
+        self._done = False
+        self._result = None
+        self._exc_info = None
+        self._callbacks = []
+
+    def __repr__(self):
+        return "<Future %s>" % ("done" if self._done else "pending")
+
+    def __await__(self):
+        return _Suspend(None if self._done else self, self.result)
+
+    def done(self):
+        return self._done
+
+    def result(self):
+        if self._exc_info is not None:
+            reraise(*self._exc_info)
+        return self._result
+
+    def setResult(self, result):
+        if not self._done:
+            self._result = result
+            self._setDone()
+
+    def setException(self, exc_info):
+        if not self._done:
+            self._exc_info = exc_info
+            self._setDone()
+
+    def addDoneCallback(self, callback):
+        if self._done:
+            callback(self)
+        else:
+            self._callbacks.append(callback)
+
+    def _setDone(self):
+        self._done = True
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback(self)
+
+
+class _Waiting(Iterator):
+
+    # Returned by waitEvent() and callEvent(). Generator handlers yield it,
+    # the manager then runs *generator* as a task. Coroutine handlers
+    # await it, which creates a Future using *awaitable*.
+
+    def __init__(self, generator, awaitable, *args):
+        self.generator = generator
+        self._awaitable = awaitable
+        self._args = args
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self.generator)
+
+    def send(self, value):
+        return self.generator.send(value)
+
+    def throw(self, *args):
+        return self.generator.throw(*args)
+
+    def close(self):
+        return self.generator.close()
+
+    def __await__(self):
+        return self._awaitable(*self._args).__await__()
+
+
 class Sleep(Iterator):
 
     def __init__(self, seconds):
@@ -81,6 +195,9 @@ class Sleep(Iterator):
             raise StopIteration()
         return self
 
+    def __await__(self):
+        return _Suspend(self, lambda: None)
+
     @property
     def expired(self):
         return time() >= self.expiry
@@ -112,9 +229,52 @@ _dummy = Dummy()
 del Dummy
 
 
+def _handlerChannel(handler):
+    channel = handler.channel
+    if channel is None:
+        # XXX: Why do we care about the event handler's channel?
+        #      This probably costs us performance for what?
+        #      I've not ever had to rely on this in practice...
+        channel = getattr(
+            getattr(
+                handler, "im_self", getattr(
+                    handler, "__self__", _dummy
+                )
+            ),
+            "channel", None
+        )
+    return channel
+
+
+def _indexComponent(index, component, add=True):
+    types, channels = index
+    keys = (
+        (types, component.__class__),
+        (channels, getattr(component, "channel", None)),
+    )
+
+    for entries, key in keys:
+        if add:
+            entries.setdefault(key, {})[component] = None
+        else:
+            components = entries.get(key)
+            if components is not None:
+                components.pop(component, None)
+                if not components:
+                    del entries[key]
+
+
+def _discard(entries, key, value):
+    values = entries.get(key)
+    if values is not None:
+        values.discard(value)
+        if not values:
+            del entries[key]
+
+
 class _State(object):
 
-    __slots__ = ('task', 'run', 'flag', 'event', 'timeout', 'parent', 'task_event', 'tick_handler')
+    __slots__ = ('task', 'run', 'flag', 'event', 'timeout', 'parent', 'task_event', 'timer')
 
     def __init__(self, timeout):
         self.task = None
@@ -124,44 +284,348 @@ class _State(object):
         self.timeout = timeout
         self.parent = None
         self.task_event = None
-        self.tick_handler = None
+        self.timer = None
+
+
+class TimerHandle(object):
+
+    """
+    A callback scheduled with :meth:`Manager.callLater` or
+    :meth:`Manager.callAt`. Call :meth:`cancel` to prevent it from being
+    invoked.
+    """
+
+    __slots__ = ("when", "callback", "args", "kwargs", "cancelled", "_root")
+
+    def __init__(self, when, callback, args, kwargs, root):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        self._root = root
+
+    def __repr__(self):
+        return "<TimerHandle %r at %r%s>" % (
+            self.callback, self.when, " cancelled" if self.cancelled else ""
+        )
+
+    def cancel(self):
+        if not self.cancelled:
+            self.cancelled = True
+            self._root._timers_cancelled += 1
+
+
+class EventSource(object):
+
+    """
+    An event source added with :meth:`Manager.addSource`. The main loop
+    calls it when it is due, call :meth:`wakeup` to declare that it is
+    and :meth:`remove` to stop calling it.
+    """
+
+    __slots__ = (
+        "callback", "args", "kwargs", "removed", "_manager", "_timer", "_lock"
+    )
+
+    def __init__(self, manager, callback, args, kwargs):
+        self.callback = callback
+        self.args = args
+        self.kwargs = kwargs
+        self.removed = False
+        self._manager = manager
+        self._timer = None
+        self._lock = RLock()
+
+    def __repr__(self):
+        timer = self._timer
+        return "<EventSource %r%s>" % (
+            self.callback, " removed" if self.removed else
+            " due at %r" % timer.when if timer is not None else ""
+        )
+
+    @property
+    def when(self):
+        """The time the source is due at, None if it isn't"""
+
+        timer = self._timer
+        return timer.when if timer is not None else None
+
+    def wakeup(self, delay=0):
+        """
+        Declare that the source is due in *delay* seconds. Has no effect
+        if it is already due earlier. May be called by any thread.
+        """
+
+        with self._lock:
+            if self.removed:
+                return
+
+            when = time() + delay
+            timer = self._timer
+            if timer is not None:
+                if timer.when <= when:
+                    return
+                timer.cancel()
+
+            # Scheduled with the root the component has now
+            self._timer = self._manager.callAt(when, self._run)
+
+    def remove(self):
+        with self._lock:
+            self.removed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _run(self):
+        with self._lock:
+            self._timer = None
+            if self.removed:
+                return
+
+        delay = self.callback(*self.args, **self.kwargs)
+        if delay is not None:
+            self.wakeup(delay)
+
+
+def _channelsKey(event, channels):
+    return channels
 
 
 class _EventQueue(object):
-    __slots__ = ('_queue', '_priority_queue', '_counter', '_flush_batch')
+    __slots__ = (
+        '_queue', '_batch', '_priority_batch', '_prioritized', '_flush_batch',
+        '_inbox', '_subqueues', '_waiting', '_key', '_weights', '_quantum',
+        '_capacity', '_policies', '_high', '_low', '_above',
+        '_dropped',
+    )
 
     def __init__(self):
         self._queue = deque()
-        self._priority_queue = []
-        self._counter = count()
+        self._batch = deque()
+        self._priority_batch = None
+        # True if an event with a priority other than 0 is in _queue
+        self._prioritized = False
         self._flush_batch = 0
+        # Events posted by other threads. Appending to and popping from
+        # a deque is atomic, so no lock is needed.
+        self._inbox = deque()
+        # Per key queues if fair scheduling is used, see setFair
+        self._subqueues = None
+        self._waiting = 0
+        self._key = None
+        self._weights = None
+        self._quantum = None
+        # Limits, see setLimit
+        self._capacity = None
+        self._policies = None
+        self._high = None
+        self._low = None
+        self._above = False
+        self._dropped = 0
 
     def __len__(self):
-        return len(self._queue) + len(self._priority_queue)
+        return (
+            len(self._queue) + self._flush_batch + len(self._inbox) +
+            self._waiting
+        )
+
+    def setFair(self, key, weights, quantum):
+        if self._subqueues is None:
+            self._subqueues = OrderedDict()
+        self._key = key
+        self._weights = weights
+        self._quantum = quantum
+
+    def setLimit(self, capacity, policies, high, low):
+        policies = dict(policies or {})
+        for policy in policies.values():
+            if policy not in POLICIES:
+                raise ValueError(
+                    "policy must be one of %s" % ", ".join(POLICIES)
+                )
+        self._capacity = capacity
+        self._policies = policies
+        self._high = capacity if high is None else high
+        self._low = self._high // 2 if low is None else low
+        self._above = False
+
+    def full(self):
+        return self._capacity is not None and len(self) >= self._capacity
+
+    def policyFor(self, event):
+        policies = self._policies
+        if event.name in policies:
+            return policies[event.name]
+        for cls in type(event).__mro__:
+            if cls in policies:
+                return policies[cls]
+        return "block"
+
+    def _pending(self):
+        # The queues holding events that have not been dispatched yet
+        if self._subqueues:
+            return list(self._subqueues.values()) + [self._queue]
+        return [self._queue]
+
+    def _admit(self, event, channel, priority):
+        # Called with a full queue, returns False if *event* is dropped
+        policy = self.policyFor(event)
+        if policy == "drop_oldest":
+            cls = type(event)
+            for queue in self._pending():
+                for i, item in enumerate(queue):
+                    if type(item[1]) is cls:
+                        del queue[i]
+                        item[1].cancel()
+                        self._dropped += 1
+                        return True
+            # Nothing to make room for it, dropped like drop_newest
+        elif policy == "coalesce":
+            for queue in self._pending():
+                for i, item in enumerate(queue):
+                    if item[1].name == event.name and item[2] == channel:
+                        # The new event takes the place of the old one,
+                        # dispatched as early as the earlier of both
+                        priority = min(item[0], priority)
+                        queue[i] = (priority, event, channel)
+                        if priority and queue is self._queue:
+                            self._prioritized = True
+                        item[1].cancel()
+                        self._dropped += 1
+                        return False
+            return True
+        elif policy == "block":
+            # Handlers can't wait for themselves
+            return True
+
+        event.cancel()
+        self._dropped += 1
+        return False
 
     def drainFrom(self, other_queue):
+        other_queue._drainInbox()
+        if other_queue._subqueues:
+            # Events waiting in subqueues have been fired first
+            for queue in other_queue._subqueues.values():
+                self._queue.extend(queue)
+                self._prioritized = self._prioritized or \
+                    any(item[0] for item in queue)
+            other_queue._subqueues.clear()
+            other_queue._waiting = 0
         self._queue.extend(other_queue._queue)
+        self._prioritized = self._prioritized or other_queue._prioritized
         other_queue._queue.clear()
+        other_queue._prioritized = False
         # Queue is currently flushing events /o\
-        assert not len(other_queue._priority_queue)
+        assert not other_queue._flush_batch
 
     def append(self, event, channel, priority):
-        self._queue.append((priority, next(self._counter), (event, channel)))
+        if self._capacity is not None and len(self) >= self._capacity \
+                and not self._admit(event, channel, priority):
+            return
+        self._queue.append((priority, event, channel))
+        if priority:
+            self._prioritized = True
+
+    def post(self, event, channel, priority):
+        self._inbox.append((priority, event, channel))
+
+    def _drainInbox(self):
+        inbox, queue = self._inbox, self._queue
+        if self._capacity is not None:
+            # Events still in the inbox don't count against the capacity
+            items = []
+            while inbox:
+                items.append(inbox.popleft())
+            for priority, event, channel in items:
+                self.append(event, channel, priority)
+            return
+        while inbox:
+            item = inbox.popleft()
+            queue.append(item)
+            if item[0]:
+                self._prioritized = True
+
+    def _nextRound(self):
+        # Sort the queued events into their subqueues and take up to
+        # quantum * weight events from each subqueue in turn.
+        queue, subqueues, key = self._queue, self._subqueues, self._key
+        self._waiting += len(queue)
+        while queue:
+            item = queue.popleft()
+            k = key(item[1], item[2])
+            subqueue = subqueues.get(k)
+            if subqueue is None:
+                subqueue = subqueues[k] = deque()
+            subqueue.append(item)
+
+        batch, prioritized = deque(), False
+        weights, quantum = self._weights, self._quantum
+        for k, subqueue in list(subqueues.items()):
+            n = max(1, int(quantum * weights.get(k, 1))) if weights \
+                else quantum
+            while subqueue and n > 0:
+                item = subqueue.popleft()
+                batch.append(item)
+                prioritized = prioritized or item[0]
+                n -= 1
+            if not subqueue:
+                del subqueues[k]
+
+        self._waiting -= len(batch)
+        self._prioritized = False
+        return batch, prioritized
 
     def dispatchEvents(self, dispatcher):
+        # Returns the size of the batch started, 0 if the current batch
+        # is continued
+        started = 0
         if self._flush_batch == 0:
-            # FIXME: Might be faster to use heapify instead of pop +
-            # heappush. Though, with regards to thread safety this
-            # appears to be the better approach.
-            self._flush_batch = count = len(self._queue)
-            while count:
-                count -= 1
-                heappush(self._priority_queue, self._queue.popleft())
+            if self._inbox:
+                self._drainInbox()
+
+            if self._subqueues is not None:
+                # Fair scheduling, the next round is the next batch
+                batch, prioritized = self._nextRound()
+            else:
+                # The current content of the queue is the next batch,
+                # events fired while it is dispatched are queued for the
+                # next one.
+                batch, self._queue = self._queue, deque()
+                prioritized, self._prioritized = self._prioritized, False
+            self._flush_batch = started = len(batch)
+
+            if prioritized:
+                # Lower priorities first, events with the same priority in
+                # the order they have been fired.
+                self._priority_batch = [
+                    (priority, i, event, channels)
+                    for i, (priority, event, channels) in enumerate(batch)
+                ]
+                heapify(self._priority_batch)
+            else:
+                # Only events with the default priority, keep them FIFO
+                self._priority_batch = None
+                self._batch = batch
+
+        # Note that dispatching may flush recursively and continue with
+        # the current batch.
+        priority_batch = self._priority_batch
+        if priority_batch is not None:
+            while self._flush_batch > 0:
+                self._flush_batch -= 1  # Decrement first!
+                (_, _, event, channels) = heappop(priority_batch)
+                dispatcher(event, channels, self._flush_batch)
+        else:
+            batch = self._batch
+            while self._flush_batch > 0:
+                self._flush_batch -= 1  # Decrement first!
+                (_, event, channels) = batch.popleft()
+                dispatcher(event, channels, self._flush_batch)
 
-        while self._flush_batch > 0:
-            self._flush_batch -= 1  # Decrement first!
-            (event, channels) = heappop(self._priority_queue)[2]
-            dispatcher(event, channels, self._flush_batch)
+        return started
 
 
 class Manager(object):
@@ -219,15 +683,39 @@ class Manager(object):
     The event currently being handled.
     """
 
+    _currently_resuming = None
+    """
+    The task being resumed or the timer callback being run, as a tuple
+    of the generator or callback and the event it belongs to (if any).
+    """
+
     def __init__(self, *args, **kwargs):
         "initializes x; see x.__class__.__doc__ for signature"
 
         self._queue = _EventQueue()
+        # Other threads waiting for room in a limited queue
+        self._space = Condition()
+        self._space_waiting = 0
+        # See profile
+        self._profiler = None
+        self._stats_timer = None
+        # See recorder.FlightRecorder
+        self._recorder = None
 
         self._tasks = set()
+        # True if tasks have been registered since tasks were last run.
+        # Those are ready to run, others are polling.
+        self._tasks_fresh = False
+        self._timers = []
+        self._timers_counter = count()
+        self._timers_cancelled = 0
         self._cache = dict()
+        self._cache_updates = deque()
+        self._cache_channels = dict()
         self._globals = set()
         self._handlers = dict()
+        self._handler_index = None
+        self._handler_names = None
 
         self._flush_batch = 0
         self._cache_needs_refresh = False
@@ -235,12 +723,18 @@ class Manager(object):
         self._executing_thread = None
         self._flushing_thread = None
         self._running = False
+        self._wakeup_pending = False
+        self._loop = None
+        self._loop_call = None
+        self._loop_ticking = False
         self.__thread = None
         self.__process = None
         self._lock = RLock()
 
         self.root = self.parent = self
         self.components = set()
+        self._component_types = dict()
+        self._component_index = None
 
     def __nonzero__(self):
         "x.__nonzero__() <==> bool(x)"
@@ -275,8 +769,7 @@ class Manager(object):
         Return True if the Component y is registered.
         """
 
-        components = self.components.copy()
-        return y in components or y in [c.__class__ for c in components]
+        return y in self.components or y in self._component_types
 
     def __len__(self):
         """x.__len__() <==> len(x)
@@ -367,19 +860,7 @@ class Manager(object):
         _handlers.update(self._handlers.get(name, []))
 
         for _handler in _handlers:
-            handler_channel = _handler.channel
-            if handler_channel is None:
-                # XXX: Why do we care about the event handler's channel?
-                #      This probably costs us performance for what?
-                #      I've not ever had to rely on this in practice...
-                handler_channel = getattr(
-                    getattr(
-                        _handler, "im_self", getattr(
-                            _handler, "__self__", _dummy
-                        )
-                    ),
-                    "channel", None
-                )
+            handler_channel = _handlerChannel(_handler)
 
             if channel == "*" or handler_channel in ("*", channel,) \
                     or channel is self:
@@ -393,11 +874,183 @@ class Manager(object):
 
         return handlers
 
+    def _iterHandlers(self):
+        # All handlers of this manager and its (current) subtree
+        for handlers in list(self._handlers.values()):
+            for _handler in handlers:
+                yield _handler
+        for _handler in list(self._globals):
+            yield _handler
+        for c in self.components.copy():
+            for _handler in c._iterHandlers():
+                yield _handler
+
+    def _iterComponents(self):
+        # This manager and its (current) subtree
+        todo = [self]
+        while todo:
+            c = todo.pop()
+            yield c
+            todo.extend(c.components.copy())
+
+    def _componentIndex(self):
+        """
+        Return the root's indexes of the components in its tree, by type
+        and by channel. Each maps to a dict that has the components as
+        keys, in the order of their registration. The indexes are built
+        when first used and maintained on (un)registration afterwards.
+        """
+
+        root = self.root
+        index = root._component_index
+        if index is None:
+            index = root._component_index = ({}, {})
+            for c in root._iterComponents():
+                _indexComponent(index, c)
+        return index
+
+    def _buildIndex(self):
+        self._handler_index = {}
+        self._handler_names = {}
+
+        todo = [self]
+        while todo:
+            c = todo.pop()
+            for name, handlers in list(c._handlers.items()):
+                for _handler in list(handlers):
+                    self._indexHandler(_handler, (name,))
+            for _handler in list(c._globals):
+                self._indexHandler(_handler, ("*",))
+            todo.extend(c.components.copy())
+
+    def _indexHandler(self, _handler, names=None, add=True):
+        channel = _handlerChannel(_handler)
+        if names is None:
+            names = _handler.names or ("*",)
+
+        for name in names:
+            if add:
+                self._handler_index.setdefault(channel, {}).setdefault(
+                    name, set()
+                ).add(_handler)
+                self._handler_names.setdefault(name, set()).add(_handler)
+                continue
+
+            handlers = self._handler_index.get(channel, {}).get(name)
+            if not handlers or _handler not in handlers:
+                # The handler's channel has changed since it was added
+                for c, handlers in self._handler_index.items():
+                    if _handler in handlers.get(name, ()):
+                        channel = c
+                        break
+                else:
+                    continue
+
+            _discard(self._handler_index[channel], name, _handler)
+            if not self._handler_index[channel]:
+                del self._handler_index[channel]
+            _discard(self._handler_names, name, _handler)
+
+    def _resolveHandlers(self, name, channel):
+        """
+        Return the handlers of the component tree that an event named
+        *name* is delivered to on *channel*, as :meth:`getHandlers`
+        invoked on the root does. The handlers are looked up in a flat
+        index of the tree's handlers by channel and event name.
+        """
+
+        if self._handler_index is None:
+            self._buildIndex()
+
+        handlers = set()
+
+        if channel == "*":
+            entries = self._handler_names
+            handlers.update(entries.get(name, ()))
+            handlers.update(entries.get("*", ()))
+            return handlers
+
+        for c in (channel, "*"):
+            entries = self._handler_index.get(c)
+            if entries:
+                handlers.update(entries.get(name, ()))
+                handlers.update(entries.get("*", ()))
+
+        if isinstance(channel, Manager) and channel.root is self:
+            # Events sent to a component are delivered to all its handlers
+            handlers.update(channel._handlers.get(name, ()))
+            handlers.update(channel._handlers.get("*", ()))
+
+        return handlers
+
+    def _updateCache(self, handlers, names=None, add=True):
+        """
+        Queue an update of the root's handler index and dispatch cache
+        for *handlers* that have been added to or removed from the
+        component tree. Both are updated on the next dispatch. Only the
+        cache entries for the affected event names and channels are
+        dropped, handlers that listen to all events cause the whole
+        cache to be rebuilt.
+        """
+
+        root = self.root
+        for _handler in handlers:
+            if not _handler.names:
+                root._cache_needs_refresh = True
+            root._cache_updates.append((_handler, names, add))
+
+    def _refreshCache(self):
+        # Don't call self._cache.clear() from other threads,
+        # this may interfere with cache rebuild.
+        refresh = self._cache_needs_refresh
+        self._cache_needs_refresh = False
+
+        while self._cache_updates:
+            _handler, names, add = self._cache_updates.popleft()
+            if self._handler_index is not None:
+                self._indexHandler(_handler, names, add)
+
+            names = names or _handler.names
+            if refresh or not names:
+                continue
+
+            channel = _handlerChannel(_handler)
+            owner = getattr(
+                _handler, "im_self", getattr(_handler, "__self__", None)
+            )
+
+            for name in names:
+                entries = self._cache.get(name)
+                if not entries:
+                    continue
+                if channel == "*":
+                    del self._cache[name]
+                    del self._cache_channels[name]
+                    continue
+
+                # Entries are rebuilt from the index when next used
+                keys = self._cache_channels[name]
+                for c in ("*", channel, owner):
+                    for channels in list(keys.get(c, ())):
+                        del entries[channels]
+                        for k in channels:
+                            _discard(keys, k, channels)
+
+        if refresh:
+            self._cache.clear()
+            self._cache_channels.clear()
+
     def addHandler(self, f):
         method = create_bound_method(f, self) if isfunction(f) else f
 
         setattr(self, method.__name__, method)
 
+        self._storeHandler(method)
+        self._updateCache((method,))
+
+        return method
+
+    def _storeHandler(self, method):
         if not method.names and method.channel == "*":
             self._globals.add(method)
         elif not method.names:
@@ -406,10 +1059,6 @@ class Manager(object):
             for name in method.names:
                 self._handlers.setdefault(name, set()).add(method)
 
-        self.root._cache_needs_refresh = True
-
-        return method
-
     def removeHandler(self, method, event=None):
         if event is None:
             names = method.names
@@ -426,7 +1075,7 @@ class Manager(object):
                     # Handler was never part of self
                     pass
 
-        self.root._cache_needs_refresh = True
+        self._updateCache((method,), names, add=False)
 
     def registerChild(self, component):
         if component._executing_thread is not None:
@@ -435,14 +1084,43 @@ class Manager(object):
             self.root._executing_thread = component._executing_thread
             component._executing_thread = None
         self.components.add(component)
+        cls = component.__class__
+        self._component_types[cls] = self._component_types.get(cls, 0) + 1
         self.root._queue.drainFrom(component._queue)
-        self.root._cache_needs_refresh = True
+        self.root._adoptTimers(component)
+        self._updateCache(component._iterHandlers())
+        # The component's own cache isn't used while it's in the tree
+        component._cache_updates.clear()
+        component._handler_index = None
+
+        index = self.root._component_index
+        if index is not None:
+            for c in component._iterComponents():
+                _indexComponent(index, c)
+        component._component_index = None
 
     def unregisterChild(self, component):
         self.components.remove(component)
-        self.root._cache_needs_refresh = True
+        cls = component.__class__
+        self._component_types[cls] -= 1
+        if not self._component_types[cls]:
+            del self._component_types[cls]
+        self._updateCache(component._iterHandlers(), add=False)
+        # The detached subtree uses its own (possibly outdated) cache
+        # and indexes now, they are rebuilt when first used.
+        component._cache_needs_refresh = True
+        component._handler_index = None
+
+        index = self.root._component_index
+        if index is not None:
+            for c in component._iterComponents():
+                _indexComponent(index, c, add=False)
 
     def _fire(self, event, channel, priority=0):
+        profiler = self._profiler
+        if profiler is not None:
+            profiler.fired(event)
+
         # check if event is fired while handling an event
         th = (self._executing_thread or self._flushing_thread)
         if thread.get_ident() == (th.ident if th else None) and \
@@ -455,28 +1133,54 @@ class Manager(object):
                 event.effects = 1
                 self._currently_handling.effects += 1
 
-            self._queue.append(event, channel, priority)
+            if self._recorder is not None:
+                self._recorder.fired(event, self._currently_handling)
+
+            queue = self._queue
+            queue.append(event, channel, priority)
+
+            if queue._high is not None and not queue._above:
+                self._checkQueue()
+
+            if self._loop is not None:
+                self._loopWakeup()
 
         # the event comes from another thread
         else:
-            # Another thread has provided us with something to do.
+            if self._recorder is not None:
+                self._recorder.fired(event, None)
+
+            if self._queue.full() and not self._waitForSpace(event, th):
+                return
+
+            # Another thread has provided us with something to do. The
+            # event is posted to the queue's inbox without locking.
+            self._queue.post(event, channel, priority)
+
             # If the component is running, we must make sure that
             # any pending generate event waits no longer, as there
-            # is something to do now.
+            # is something to do now. This is only required once per
+            # generate_events, later events are picked up by the same
+            # iteration of the main loop.
+            if self._wakeup_pending:
+                return
+            self._wakeup_pending = True
+
             with self._lock:
                 # Modifications of attribute self._currently_handling
-                # (in _dispatch()), calling reduce_time_left(0). and adding an
-                # event to the (empty) event queue must be atomic, so we have
-                # to lock. We can save the locking around
+                # (in _dispatch()) and calling reduce_time_left(0) must be
+                # atomic, so we have to lock. We can save the locking around
                 # self._currently_handling = None though, but then need to copy
                 # it to a local variable here before performing a sequence of
                 # operations that assume its value to remain unchanged.
                 handling = self._currently_handling
 
-                self._queue.append(event, channel, priority)
                 if isinstance(handling, generate_events):
                     handling.reduce_time_left(0)
 
+            if self._loop is not None:
+                self._loopWakeup()
+
     def fireEvent(self, event, *channels, **kwargs):
         """Fire an event into the system.
 
@@ -488,6 +1192,10 @@ class Manager(object):
            the firing component's channel. And eventually,
            when set neither, the event is delivered on all
            channels ("*").
+        :param forget: If ``True``, fire the event without keeping track
+           of its handlers' results. No :class:`~.values.Value` is
+           created, a shared empty value is returned instead. Defaults
+           to the event's :attr:`forget` attribute.
         """
 
         if not channels:
@@ -495,21 +1203,295 @@ class Manager(object):
 
         event.channels = channels
 
-        event.value = Value(event, self)
+        if kwargs.pop("forget", event.forget):
+            event.value = _null_value
+        else:
+            event.value = Value(event, self)
         self.root._fire(event, channels, **kwargs)
 
         return event.value
 
     fire = fireEvent
 
+    def useFairQueue(self, key=None, weights=None, quantum=QUANTUM):
+        """
+        Schedule the events in the root manager's queue fairly. Events
+        are sorted into a queue per key, and each flush dispatches up to
+        *quantum* events from each of these queues in turn, instead of
+        all queued events in the order they have been fired. A flood of
+        events on one channel then doesn't delay the events on others.
+
+        :param key: called with an event and its channels, returns the
+           key of the queue the event belongs to. Defaults to the
+           channels. To keep the connections of a server apart, it
+           could e.g. return the socket of ``read`` events.
+        :param weights: optional dict mapping keys to weights. The
+           queue of a key gets *quantum* times its weight events per
+           flush, the weight of other keys is 1.
+        :param quantum: number of events per queue and flush.
+
+        Events of the same queue are dispatched in the order they have
+        been fired. Events dispatched by the same flush are ordered by
+        their priority as usual.
+        """
+
+        self.root._queue.setFair(key or _channelsKey, weights, quantum)
+
+    def limitQueue(self, capacity, policies=None, high=None, low=None):
+        """
+        Limit the number of events in the root manager's queue to
+        *capacity*. What happens to an event fired while the queue is
+        full depends on the policy for its class:
+
+        - ``"block"``: other threads firing the event wait until there
+          is room in the queue. Handlers can't wait for the queue to be
+          flushed and always queue the event. This is the default.
+        - ``"drop_newest"``: the event is not queued.
+        - ``"drop_oldest"``: the oldest queued event of the same class
+          is removed from the queue instead. If there is none, the
+          event is not queued, like with ``"drop_newest"``.
+        - ``"coalesce"``: the event replaces a queued event with the
+          same name and channels, keeping the place of the queued event
+          and the higher of both priorities. If there is none, it is
+          queued.
+
+        Events that are not queued are cancelled.
+
+        :param policies: dict mapping event classes (including their
+           subclasses) or event names to policies.
+        :param high: when the number of queued events reaches *high*,
+           a :class:`~.events.queue_high` event is fired. Defaults to
+           *capacity*.
+        :param low: when it has fallen to *low* afterwards, a
+           :class:`~.events.queue_low` event is fired. Defaults to half
+           of *high*.
+
+        Socket components stop reading while the queue is above the
+        high watermark.
+        """
+
+        self.root._queue.setLimit(capacity, policies, high, low)
+
+    def profile(self, sample=1, interval=None):
+        """
+        Record how long the handlers of this component tree take and
+        how busy the root manager's queue is. Fired events are counted
+        and the handlers of one in *sample* events are timed. Sampling
+        one in 10 or more events is cheap enough to leave profiling on
+        in production.
+
+        If *interval* is given, a :class:`~.events.stats` event with a
+        snapshot of the statistics is fired on all channels every
+        *interval* seconds, and the statistics are reset.
+
+        If *sample* is 0, profiling is stopped.
+
+        :returns: the :class:`~.profiler.Profiler`, its
+            :meth:`~.profiler.Profiler.snapshot` method returns the
+            statistics. None if profiling is stopped.
+        """
+
+        root = self.root
+        if root._stats_timer is not None:
+            root._stats_timer.cancel()
+            root._stats_timer = None
+
+        if not sample:
+            root._profiler = None
+            return None
+
+        root._profiler = Profiler(sample)
+        if interval is not None:
+            root._stats_timer = root.callLater(
+                interval, root._fireStats, interval
+            )
+
+        return root._profiler
+
+    def _fireStats(self, interval):
+        profiler = self._profiler
+        if profiler is not None:
+            self._stats_timer = self.callLater(
+                interval, self._fireStats, interval
+            )
+            self.fire(stats(profiler.snapshot(reset=True)), "*")
+
     def registerTask(self, g):
-        self.root._tasks.add(g)
+        root = self.root
+        root._tasks.add(g)
+        root._tasks_fresh = True
 
     def unregisterTask(self, g):
         if g in self.root._tasks:
             self.root._tasks.remove(g)
 
-    def waitEvent(self, event, *channels, **kwargs):  # noqa
+    def callAt(self, when, callback, *args, **kwargs):
+        """
+        Schedule *callback* to be invoked with the given arguments by the
+        root manager's main loop once the time *when* (as returned by
+        :func:`time.time`) has been reached.
+
+        All callbacks of a component tree are kept in a single heap
+        maintained by the root manager. Only expired entries are looked at
+        in each iteration and the next deadline limits the time
+        pollers may wait for I/O.
+
+        :returns: a :class:`TimerHandle` that can be used to cancel
+            the call.
+        """
+
+        root = self.root
+        handle = TimerHandle(when, callback, args, kwargs, root)
+
+        with root._lock:
+            heappush(root._timers, (when, next(root._timers_counter), handle))
+            root._timersChanged(when)
+
+        if root._loop is not None:
+            root._loopWakeup(max(0, when - time()))
+
+        return handle
+
+    def _timersChanged(self, when):
+        # Called with the lock held when a call has been scheduled
+        handling = self._currently_handling
+        if isinstance(handling, generate_events):
+            th = (self._executing_thread or self._flushing_thread)
+            if thread.get_ident() == (th.ident if th else None):
+                handling.reduce_time_left(max(0, when - time()))
+            else:
+                # Wake up the main loop to pick up the new deadline
+                handling.reduce_time_left(0)
+
+    def _adoptTimers(self, other):
+        # Move the calls scheduled by the component tree of *other*
+        # before it has been registered to the timers of this root.
+        # Includes those of event sources and parked tasks.
+        with other._lock:
+            handles = [t[2] for t in other._timers if not t[2].cancelled]
+            del other._timers[:]
+            other._timers_cancelled = 0
+
+        if not handles:
+            return
+
+        with self._lock:
+            for handle in handles:
+                handle._root = self
+                heappush(
+                    self._timers,
+                    (handle.when, next(self._timers_counter), handle)
+                )
+            when = min(handle.when for handle in handles)
+            self._timersChanged(when)
+
+        if self._loop is not None:
+            self._loopWakeup(max(0, when - time()))
+
+    def callLater(self, delay, callback, *args, **kwargs):
+        """
+        Schedule *callback* to be invoked with the given arguments after
+        *delay* seconds. See :meth:`callAt`.
+        """
+
+        return self.callAt(time() + delay, callback, *args, **kwargs)
+
+    def addSource(self, callback, *args, **kwargs):
+        """
+        Add a source of events to the main loop, which calls
+        *callback* with the given arguments only when the source is due.
+
+        The source is due right away. The callback fires the events it
+        has and returns the number of seconds until the source is due
+        again, or None if it waits for :meth:`EventSource.wakeup`. The
+        time the next source is due at limits the time pollers may wait
+        for I/O, like the deadlines of :meth:`callAt`. If the callback
+        raises an exception, the source waits for a wakeup.
+
+        Sources replace ``generate_events`` handlers that check for
+        events in each iteration of the main loop, which still work.
+        Sources waiting for file descriptors register them with the
+        poller and wake up from its ``_read`` events (see
+        :meth:`~.pollers.BasePoller.addReader`).
+
+        Only the components using sources are called when due, currently
+        :class:`~circuits.io.process.Process` and the STOMP client. The
+        main loop still fires ``generate_events`` on all channels in
+        every iteration: the poller (or the fallback generator if there
+        is none) waits for I/O in its handler and the components that
+        haven't been converted to sources keep handling it.
+
+        :returns: an :class:`EventSource`.
+        """
+
+        source = EventSource(self, callback, args, kwargs)
+        source.wakeup(0)
+        return source
+
+    def _runTimers(self):
+        timers = self._timers
+
+        if self._timers_cancelled > 64 and \
+                self._timers_cancelled > len(timers) // 2:
+            # Compact the heap if most entries have been cancelled
+            with self._lock:
+                timers[:] = [t for t in timers if not t[2].cancelled]
+                heapify(timers)
+                self._timers_cancelled = 0
+
+        # Calls scheduled by the callbacks below are left for the next
+        # iteration, even if they are already due.
+        now, mark = time(), next(self._timers_counter)
+        while timers and (timers[0][2].cancelled or
+                          (timers[0][0] <= now and timers[0][1] < mark)):
+            with self._lock:
+                handle = heappop(timers)[2]
+
+            if handle.cancelled:
+                self._timers_cancelled -= 1
+                continue
+
+            # Invoking the handle doesn't count as cancelling it
+            handle.cancelled = True
+
+            self._currently_resuming = (handle.callback, None)
+            try:
+                handle.callback(*handle.args, **handle.kwargs)
+            except (KeyboardInterrupt, SystemExit):
+                raise
+            except:
+                self._fireException(_exc_info())
+            finally:
+                self._currently_resuming = None
+
+    def _fireException(self, err, handler=None, fevent=None):
+        self.fire(exception(*err, handler=handler, fevent=fevent))
+
+        # The recorder may dump the trace leading to the error
+        recorder = self._recorder
+        if recorder is not None:
+            recorder.failed(fevent)
+
+    def waitEvent(self, event, *channels, **kwargs):
+        """
+        Suspend execution until the given event (or the next event
+        with the given name) has been dispatched. The result must be
+        ``yield``-ed by generator handlers or ``await``-ed by coroutine
+        handlers, see :meth:`callEvent`.
+
+        If *timeout* (in seconds) is given and not negative, a
+        :class:`TimeoutError` is raised in the waiting handler when
+        the event hasn't been dispatched before the timeout expires.
+        """
+
+        return _Waiting(
+            self._waitEvent(event, *channels, **kwargs),
+            self._waitFuture, event, channels, kwargs.get("timeout", -1)
+        )
+
+    wait = waitEvent
+
+    def _waitEvent(self, event, *channels, **kwargs):  # noqa
         # XXX: C901: This has a high McCabe complexity score of 16.
         # TODO: Refactor this method.
 
@@ -536,22 +1518,20 @@ class Manager(object):
             if state.event == event.parent:
                 state.flag = True
                 self.registerTask((state.task_event, state.task, state.parent))
-                if state.timeout > 0:
-                    self.removeHandler(state.tick_handler, "generate_events")
-
-        def _on_tick(self):
-            if state.timeout == 0:
-                self.registerTask(
-                    (
-                        state.task_event,
-                        (e for e in (ExceptionWrapper(TimeoutError()),)),
-                        state.parent
-                    )
+                if state.timer is not None:
+                    state.timer.cancel()
+
+        def _on_timeout():
+            self.registerTask(
+                (
+                    state.task_event,
+                    (e for e in (ExceptionWrapper(TimeoutError()),)),
+                    state.parent
                 )
-                self.removeHandler(_on_done_handler, "%s_done" % event_name)
-                self.removeHandler(_on_tick_handler, "generate_events")
-            elif state.timeout > 0:
-                state.timeout -= 1
+            )
+            if not state.run:
+                self.removeHandler(_on_event_handler, event_name)
+            self.removeHandler(_on_done_handler, "%s_done" % event_name)
 
         if not channels:
             channels = (None,)
@@ -561,9 +1541,10 @@ class Manager(object):
                 handler(event_name, channel=channel)(_on_event))
             _on_done_handler = self.addHandler(
                 handler("%s_done" % event_name, channel=channel)(_on_done))
-            if state.timeout >= 0:
-                _on_tick_handler = state.tick_handler = self.addHandler(
-                    handler("generate_events", channel=channel)(_on_tick))
+
+        if state.timeout >= 0:
+            # The deadline is kept with the root's timers
+            state.timer = self.callLater(state.timeout, _on_timeout)
 
         yield state
 
@@ -572,7 +1553,49 @@ class Manager(object):
         if state.event is not None:
             yield CallValue(state.event.value)
 
-    wait = waitEvent
+    def _waitFuture(self, event, channels, timeout):
+        if isinstance(event, Event):
+            future = self._eventFuture(event)
+        else:
+            future = Future()
+            handlers = []
+
+            def _remove():
+                for h in handlers:
+                    self.removeHandler(h, event)
+                del handlers[:]
+
+            def _on_event(self, event, *args, **kwargs):
+                if not handlers:
+                    return
+                _remove()
+                self._eventFuture(event).addDoneCallback(
+                    lambda f: future.setResult(f.result())
+                )
+
+            for channel in channels or (None,):
+                handlers.append(
+                    self.addHandler(handler(event, channel=channel)(_on_event))
+                )
+
+        if timeout < 0:
+            return future
+
+        waiter = Future()
+        future.addDoneCallback(lambda f: waiter.setResult(f.result()))
+        timer = self.callLater(
+            timeout, waiter.setException, (TimeoutError, TimeoutError(), None)
+        )
+        waiter.addDoneCallback(lambda f: timer.cancel())
+        if not isinstance(event, Event):
+            # Stop waiting for the event once timed out, like _waitEvent
+            waiter.addDoneCallback(lambda f: _remove())
+        return waiter
+
+    def _eventFuture(self, event):
+        if event.future is None:
+            event.future = Future()
+        return event.future
 
     def callEvent(self, event, *channels, **kwargs):
         """
@@ -583,13 +1606,33 @@ class Manager(object):
         It effectively creates and returns a generator
         that will be invoked by the main loop until the event has
         been dispatched (see :func:`circuits.core.handlers.handler`).
+
+        Coroutine handlers (``async def``) ``await`` the result instead
+        (e.g. "``value = await self.callEvent(event)``"). They are resumed
+        directly when the event is done, no handlers are added for
+        waiting.
+
+        A *timeout* is given in seconds, see :meth:`waitEvent`.
         """
+
+        return _Waiting(
+            self._callEvent(event, *channels, **kwargs),
+            self._callFuture, event, channels, kwargs.get("timeout", -1)
+        )
+
+    call = callEvent
+
+    def _callEvent(self, event, *channels, **kwargs):
         value = self.fire(event, *channels)
-        for r in self.waitEvent(event, *event.channels, **kwargs):
+        for r in self._waitEvent(event, *event.channels, **kwargs):
             yield r
         yield CallValue(value)
 
-    call = callEvent
+    def _callFuture(self, event, channels, timeout):
+        # Attach the future before the event can be dispatched
+        self._eventFuture(event)
+        self.fire(event, *channels)
+        return self._waitFuture(event, channels, timeout)
 
     def _flush(self):
         # Handle events currently on queue, but none of the newly generated
@@ -597,10 +1640,65 @@ class Manager(object):
         old_flushing = self._flushing_thread
         try:
             self._flushing_thread = current_thread()
-            self._queue.dispatchEvents(self._dispatcher)
+            queue = self._queue
+            if queue._high is not None and queue._inbox and \
+                    not queue._flush_batch:
+                # Apply the limits to the events posted by other threads
+                queue._drainInbox()
+                self._checkQueue()
+            profiler = self._profiler
+            if profiler is None:
+                queue.dispatchEvents(self._dispatcher)
+            else:
+                queued = len(queue)
+                batch = queue.dispatchEvents(self._dispatcher)
+                if batch:
+                    profiler.flushed(queued, batch)
         finally:
             self._flushing_thread = old_flushing
 
+        if self._queue._high is not None:
+            self._checkQueue()
+
+    def _checkQueue(self):
+        queue = self._queue
+        n = len(queue)
+        if queue._above:
+            if n <= queue._low:
+                queue._above = False
+                self.fire(queue_low(n), "*")
+        elif n >= queue._high:
+            queue._above = True
+            self.fire(queue_high(n), "*")
+
+        if self._space_waiting and n < queue._capacity:
+            with self._space:
+                self._space.notify_all()
+
+    def _waitForSpace(self, event, th):
+        # Called by other threads with a full queue, returns False if
+        # *event* is dropped
+        queue = self._queue
+        policy = queue.policyFor(event)
+        if policy == "drop_newest":
+            event.cancel()
+            queue._dropped += 1
+            return False
+        elif policy != "block" or th is None or \
+                thread.get_ident() == th.ident:
+            # Applied when the event is moved to the queue
+            return True
+
+        with self._space:
+            self._space_waiting += 1
+            try:
+                while queue.full() and self._running:
+                    self._space.wait(TIMEOUT)
+            finally:
+                self._space_waiting -= 1
+
+        return True
+
     def flushEvents(self):
         """
         Flush all Events in the Event Queue. If called on a manager
@@ -626,15 +1724,15 @@ class Manager(object):
         eargs = event.args
         ekwargs = event.kwargs
 
-        if self._cache_needs_refresh:
-            # Don't call self._cache.clear() from other threads,
-            # this may interfere with cache rebuild.
-            self._cache.clear()
-            self._cache_needs_refresh = False
+        if self._cache_needs_refresh or self._cache_updates:
+            self._refreshCache()
         try:  # try/except is fastest if successful in most cases
-            event_handlers = self._cache[(event.name, channels)]
+            event_handlers = self._cache[event.name][channels]
         except KeyError:
-            h = (self.getHandlers(event, channel) for channel in channels)
+            h = (
+                self._resolveHandlers(event.name, channel)
+                for channel in channels
+            )
 
             event_handlers = sorted(
                 chain(*h),
@@ -652,15 +1750,29 @@ class Manager(object):
                 from .helpers import FallBackSignalHandler
                 event_handlers.append(FallBackSignalHandler()._on_signal)
 
-            self._cache[(event.name, channels)] = event_handlers
+            self._cache.setdefault(event.name, {})[channels] = event_handlers
+            keys = self._cache_channels.setdefault(event.name, {})
+            for c in channels:
+                keys.setdefault(c, set()).add(channels)
 
         if isinstance(event, generate_events):
             with self._lock:
+                # Events posted by other threads after this point must
+                # wake us up again. Those posted before are in the queue.
+                self._wakeup_pending = False
                 self._currently_handling = event
                 if remaining > 0 or len(self._queue) or not self._running:
                     event.reduce_time_left(0)
-                elif self._tasks:
-                    event.reduce_time_left(TIMEOUT)
+                else:
+                    if self._tasks:
+                        # Polling tasks are run every TIMEOUT seconds
+                        event.reduce_time_left(
+                            0 if self._tasks_fresh else TIMEOUT
+                        )
+                    if self._timers:
+                        event.reduce_time_left(
+                            max(0, self._timers[0][0] - time())
+                        )
                 # From now on, firing an event will reduce time left
                 # to 0, which prevents event handlers from waiting (or wakes
                 # them up with resume if they should be waiting already)
@@ -670,8 +1782,16 @@ class Manager(object):
         value = None
         err = None
 
+        profiler = self._profiler
+        if profiler is not None and not profiler.sampled():
+            profiler = None
+        recorder = self._recorder
+        timed = profiler is not None or recorder is not None
+
         for event_handler in event_handlers:
             event.handler = event_handler
+            if timed:
+                started = clock()
             try:
                 if event_handler.event:
                     value = event_handler(event, *eargs, **ekwargs)
@@ -691,20 +1811,33 @@ class Manager(object):
                         *event.channels
                     )
 
-                self.fire(exception(*err, handler=event_handler, fevent=event))
+                self._fireException(err, event_handler, event)
+
+            if timed:
+                elapsed = clock() - started
+                if profiler is not None:
+                    profiler.handled(event_handler, elapsed)
+                if recorder is not None:
+                    recorder.handled(event, event_handler, started, elapsed)
 
             if value is not None:
+                if isinstance(value, _Waiting):
+                    value = value.generator
                 if isinstance(value, GeneratorType):
                     event.waitingHandlers += 1
                     event.value.promise = True
                     self.registerTask((event, value, None))
+                elif iscoroutine(value):
+                    event.waitingHandlers += 1
+                    event.value.promise = True
+                    self.callLater(0, self._resumeCoroutine, event, value)
                 else:
                     event.value.value = value
 
             # it is kind of a temporal hack to allow processing
             # of tasks, added in one of event handlers here
             if isinstance(event, generate_events) and self._tasks:
-                event.reduce_time_left(TIMEOUT)
+                event.reduce_time_left(0 if self._tasks_fresh else TIMEOUT)
 
             if event.stopped:
                 break  # Stop further event processing
@@ -716,6 +1849,9 @@ class Manager(object):
         if event.waitingHandlers:
             return
 
+        if event.future is not None:
+            event.future.setResult(event.value)
+
         # The "%s_done" event is for internal use by waitEvent only.
         # Use the "%s_success" event in your application if you are
         # interested in being notified about the last handler for
@@ -823,6 +1959,26 @@ class Manager(object):
         if code is not None:
             raise SystemExit(code)
 
+    def _processTasks(self):
+        profiler, recorder = self._profiler, self._recorder
+        if profiler is None and recorder is None:
+            for task in self._tasks.copy():
+                self._currently_resuming = (task[1], task[0])
+                self.processTask(*task)
+            self._currently_resuming = None
+            return
+
+        for task in self._tasks.copy():
+            self._currently_resuming = (task[1], task[0])
+            started = clock()
+            self.processTask(*task)
+            elapsed = clock() - started
+            if profiler is not None:
+                profiler.resumed(task[0], elapsed)
+            if recorder is not None:
+                recorder.resumed(task[0], started, elapsed)
+        self._currently_resuming = None
+
     def processTask(self, event, task, parent=None):  # noqa
         # XXX: C901: This has a high McCabe complexity score of 16.
         # TODO: Refactor this method.
@@ -830,11 +1986,15 @@ class Manager(object):
         value = None
         try:
             value = next(task)
+            if isinstance(value, _Waiting):
+                value = value.generator
             if isinstance(value, CallValue):
                 # Done here, next() will StopIteration anyway
                 self.unregisterTask((event, task, parent))
                 # We are in a callEvent
                 value = parent.send(value.value)
+                if isinstance(value, _Waiting):
+                    value = value.generator
                 if isinstance(value, GeneratorType):
                     # We loose a yield but we gain one,
                     # we don't need to change
@@ -874,11 +2034,20 @@ class Manager(object):
                     raise value.extract()
             elif isinstance(value, Sleep):
                 if value is not task:
+                    # Park the task until the sleep has expired
                     value.task = (event, task, parent)
-                    self.registerTask((event, value, parent))
-                    self.unregisterTask((event, task, parent))
+                    self.unregisterTask(value.task)
+                    self.callAt(value.expiry, self.registerTask, value.task)
+            elif isinstance(value, Future):
+                if not value.done():
+                    # Park the task until the future is done
+                    parked = (event, task, parent)
+                    self.unregisterTask(parked)
+                    value.addDoneCallback(lambda f: self.registerTask(parked))
             elif value is not None:
                 event.value.value = value
+                # Not polling, run it again without delay
+                self.root._tasks_fresh = True
         except StopIteration:
             event.waitingHandlers -= 1
             self.unregisterTask((event, task, parent))
@@ -908,13 +2077,154 @@ class Manager(object):
             if event.failure:
                 self.fire(event.child("failure", event, err), *event.channels)
 
-            self.fire(exception(*err, handler=None, fevent=event))
+            self._fireException(err, fevent=event)
+
+    def _resumeCoroutine(self, event, coro, error=None):
+        # Run by _runTimers, which resets the marker
+        self._currently_resuming = (coro, event)
+        try:
+            if error is None:
+                awaited = coro.send(None)
+            else:
+                awaited = coro.throw(error)
+        except StopIteration as e:
+            value = getattr(e, "value", None)
+            if value is not None:
+                event.value.value = value
+            event.waitingHandlers -= 1
+            if event.waitingHandlers == 0:
+                event.value.inform(True)
+                self._eventDone(event)
+            return
+        except KeyboardInterrupt:
+            self.stop()
+            return
+        except SystemExit as e:
+            self.stop(e.code)
+            return
+        except:
+            err = _exc_info()
+
+            event.value.value = err
+            event.value.errors = True
+            event.value.inform(True)
+
+            if event.failure:
+                self.fire(event.child("failure", event, err), *event.channels)
+
+            self._fireException(err, fevent=event)
+
+            event.waitingHandlers -= 1
+            self._eventDone(event, err)
+            return
+
+        if isinstance(awaited, Sleep):
+            self.callAt(awaited.expiry, self._resumeCoroutine, event, coro)
+        elif isinstance(awaited, Future):
+            awaited.addDoneCallback(
+                lambda f: self.callLater(0, self._resumeCoroutine, event, coro)
+            )
+        else:
+            error = TypeError("%r can't be awaited in a handler" % (awaited,))
+            self.callLater(0, self._resumeCoroutine, event, coro, error)
+
+    def attach(self, loop=None):
+        """
+        Run this manager on top of the :mod:`asyncio` event loop *loop*
+        (the current event loop if None) instead of in a thread of its
+        own. The method must be invoked from the loop's thread and returns
+        immediately, the loop then flushes the event queue whenever
+        events are fired.
+
+        File descriptors are watched by the loop: an
+        :class:`~.pollers.AsyncIO` poller is registered unless the
+        component tree already has one (any other poller would block
+        the loop). The next deadline of the manager's timers is scheduled
+        with ``loop.call_at``, so circuits and asyncio code share a single
+        thread and selector.
+
+        Invoke :meth:`~.stop` to detach the manager from the loop again.
+        """
+
+        from .pollers import AsyncIO, BasePoller
+        from .utils import findcmp
+
+        if loop is None:
+            import asyncio
+            loop = asyncio.get_event_loop()
+
+        poller = findcmp(self.root, BasePoller)
+        if poller is None:
+            AsyncIO(loop).register(self)
+        elif not isinstance(poller, AsyncIO):
+            raise TypeError(
+                "%r would block the event loop, use AsyncIO" % (poller,)
+            )
+
+        self._running = True
+        self.root._executing_thread = current_thread()
+        self._loop = loop
+
+        self.fire(started(self))
+
+    def _loopWakeup(self, delay=0):
+        if self._loop_ticking:
+            # Picked up at the end of the current iteration
+            return
+
+        if current_thread() is not self._executing_thread:
+            self._loop.call_soon_threadsafe(self._loopWakeup, delay)
+            return
+
+        when = self._loop.time() + delay
+        if self._loop_call is not None:
+            if self._loop_call[0] <= when:
+                return
+            self._loop_call[1].cancel()
+
+        self._loop_call = (when, self._loop.call_at(when, self._loopTick))
+
+    def _loopTick(self):
+        self._loop_call = None
+        self._loop_ticking = True
+        try:
+            if self._timers:
+                self._runTimers()
+
+            if self._tasks:
+                self._tasks_fresh = False
+                self._processTasks()
+
+            event = None
+            if self._running:
+                event = generate_events(self._lock, -1)
+                self.fire(event, "*")
+
+            if len(self._queue):
+                self.flush()
+        finally:
+            self._loop_ticking = False
+
+        if not (self._running or len(self._queue)):
+            # Fading out, handle remaining work from stop event
+            for _ in range(3):
+                self.tick()
+            self._loop = None
+            self.root._executing_thread = None
+            return
+
+        if len(self._queue):
+            self._loopWakeup()
+        if self._timers:
+            self._loopWakeup(max(0, self._timers[0][0] - time()))
+        if event is not None and event.time_left >= 0:
+            self._loopWakeup(event.time_left)
 
     def tick(self, timeout=-1):
         """
-        Execute all possible actions once. Process all registered tasks
-        and flush the event queue. If the application is running fire a
-        GenerateEvents to get new events from sources.
+        Execute all possible actions once. Run expired timers, process all
+        registered tasks and flush the event queue. If the application is
+        running fire a GenerateEvents to get new events from sources.
 
         This method is usually invoked from :meth:`~.run`. It may also be
         used to build an application specific main loop.
@@ -924,10 +2234,14 @@ class Manager(object):
             has been taken.
         :type timeout: float, measuring seconds
         """
+        # resume parked tasks and run expired callbacks
+        if self._timers:
+            self._runTimers()
+
         # process tasks
         if self._tasks:
-            for task in self._tasks.copy():
-                self.processTask(*task)
+            self._tasks_fresh = False
+            self._processTasks()
 
         if self._running:
             self.fire(generate_events(self._lock, timeout), "*")
@@ -5,6 +5,7 @@ descriptors for read/write events. Pollers:
 - Select
 - Poll
 - EPoll
+- AsyncIO
 """
 import os
 import platform
@@ -26,11 +27,15 @@ class _read(Event):
 
     """_read Event"""
 
+    forget = True
+
 
 class _write(Event):
 
     """_write Event"""
 
+    forget = True
+
 
 class _error(Event):
 
@@ -546,6 +551,92 @@ class KQueue(BasePoller):
             self.fire(_read(sock), self.getTarget(sock))
 
 
+class AsyncIO(BasePoller):
+
+    """AsyncIO(...) -> new AsyncIO Poller Component
+
+    Creates a new AsyncIO Poller Component that delegates the polling
+    of file descriptors to an :mod:`asyncio` event loop (the current
+    event loop if *loop* is None). Use it with
+    :meth:`~.manager.Manager.attach` to run a manager on top of the loop.
+    The poller never blocks and doesn't need a control connection,
+    the manager is woken up through the loop.
+    """
+
+    channel = "asyncio"
+
+    def __init__(self, loop=None, channel=channel):
+        if loop is None:
+            import asyncio
+            loop = asyncio.get_event_loop()
+
+        self._event_loop = loop
+        self._filenos = {}
+        self._pending = set()
+
+        super(AsyncIO, self).__init__(channel=channel)
+
+    def _create_control_con(self):
+        return None, None
+
+    def resume(self):
+        pass
+
+    def _ready(self, event, fd):
+        # The loop reports a descriptor in every iteration until it has
+        # been read from or written to, so fire one event per descriptor
+        # and direction until the next generate_events.
+        key = (event, fd)
+        if key not in self._pending:
+            self._pending.add(key)
+            self.fire(event(fd), self.getTarget(fd))
+
+    def _fileno(self, fd):
+        fileno = self._filenos.get(fd)
+        if fileno is None:
+            fileno = self._filenos[fd] = (
+                fd.fileno() if not isinstance(fd, int) else fd
+            )
+        return fileno
+
+    def addReader(self, source, fd):
+        super(AsyncIO, self).addReader(source, fd)
+        self._event_loop.add_reader(self._fileno(fd), self._ready, _read, fd)
+
+    def addWriter(self, source, fd):
+        super(AsyncIO, self).addWriter(source, fd)
+        self._event_loop.add_writer(self._fileno(fd), self._ready, _write, fd)
+
+    def removeReader(self, fd):
+        super(AsyncIO, self).removeReader(fd)
+        self._update(fd)
+
+    def removeWriter(self, fd):
+        super(AsyncIO, self).removeWriter(fd)
+        self._update(fd)
+
+    def discard(self, fd):
+        super(AsyncIO, self).discard(fd)
+        self._update(fd)
+
+    def _update(self, fd):
+        fileno = self._filenos.get(fd)
+        if fileno is None:
+            return
+
+        if not self.isReading(fd):
+            self._event_loop.remove_reader(fileno)
+        if not self.isWriting(fd):
+            self._event_loop.remove_writer(fileno)
+        if fd not in self._targets:
+            del self._filenos[fd]
+
+    def _generate_events(self, event):
+        self._pending.clear()
+
+
 Poller = Select
 
-__all__ = ("BasePoller", "Poller", "Select", "Poll", "EPoll", "KQueue")
+__all__ = (
+    "BasePoller", "Poller", "Select", "Poll", "EPoll", "KQueue", "AsyncIO",
+)
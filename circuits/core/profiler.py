@@ -0,0 +1,231 @@
+"""Profiler
+
+This module defines the :class:`Profiler` used by
+:meth:`~.manager.Manager.profile` to record how long the handlers of a
+component tree take and how busy its event queue is.
+
+Latencies and sizes are counted in log-linear :class:`Histogram`
+buckets allocated up front, so recording a value neither allocates
+memory nor depends on the number of values recorded.
+"""
+from time import time
+
+try:
+    from time import perf_counter as clock
+except ImportError:
+    from time import time as clock
+
+SUB_BUCKETS = 16  # Buckets per power of two, about 6% precision
+BUCKETS = SUB_BUCKETS * 40
+
+
+def _lowest(i):
+    # The lowest value counted in bucket i
+    if i < 2 * SUB_BUCKETS:
+        return i
+    e = i // SUB_BUCKETS - 1
+    return (i - e * SUB_BUCKETS) << e
+
+
+def _handlerName(handler):
+    f = getattr(handler, "__func__", handler)
+    name = getattr(f, "__qualname__", None)
+    if name is None:
+        instance = getattr(handler, "__self__", None)
+        name = "%s.%s" % (type(instance).__name__, f.__name__)
+    return name
+
+
+class Histogram(object):
+
+    """Log-linear histogram of non-negative integers
+
+    Values below 32 have a bucket each, larger values share buckets
+    of about 6% of their size with their neighbours.
+
+    :ivar count: The number of values recorded.
+    :ivar total: The sum of the values recorded.
+    :ivar max: The largest value recorded.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        if value < 2 * SUB_BUCKETS:
+            i = max(value, 0)
+        else:
+            e = value.bit_length() - 5
+            i = min(e * SUB_BUCKETS + (value >> e), BUCKETS - 1)
+
+        self.counts[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        counts = self.counts
+        for i, n in enumerate(other.counts):
+            if n:
+                counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p):
+        """Return the value *p* percent of the recorded values don't exceed
+
+        The result is the lowest value of the bucket the value is
+        counted in, so it may be up to 6% lower than the value. The
+        largest value is exact.
+        """
+
+        count = self.count
+        rank = max(1, int(count * p / 100.0 + 0.5))
+        if rank >= count:
+            return self.max
+
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return _lowest(i)
+
+    def snapshot(self, scale=1):
+        """Return a dict summarizing the histogram
+
+        Values are multiplied by *scale*, e.g. to convert microseconds
+        to seconds.
+        """
+
+        return {
+            "count": self.count,
+            "total": self.total * scale,
+            "mean": self.total * scale / self.count if self.count else 0,
+            "max": self.max * scale,
+            "p50": self.percentile(50) * scale,
+            "p90": self.percentile(90) * scale,
+            "p99": self.percentile(99) * scale,
+            "p999": self.percentile(99.9) * scale,
+        }
+
+
+class Profiler(object):
+
+    """Record handler latencies and queue statistics of a manager
+
+    :param sample: Time the handlers of one in *sample* events.
+    :type  sample: int
+
+    Every fired event is counted. With sampling, the handler and task
+    latencies are only recorded for the sampled events, so their counts
+    and totals must be multiplied by *sample* to estimate the real ones.
+    """
+
+    def __init__(self, sample=1):
+        self.sample = sample
+        self.reset()
+
+    def reset(self):
+        """Discard the statistics recorded so far"""
+
+        self.started = time()
+        self.events = {}
+        self.handlers = {}
+        self.tasks = {}
+        self.queue = Histogram()
+        self.batch = Histogram()
+
+        self._names = {}
+        self._skip = 0
+
+    def fired(self, event):
+        events = self.events
+        events[event.name] = events.get(event.name, 0) + 1
+
+    def sampled(self):
+        """Return True if the handlers of the next event are timed"""
+
+        self._skip -= 1
+        if self._skip > 0:
+            return False
+        self._skip = self.sample
+        return True
+
+    def handled(self, handler, elapsed):
+        key = getattr(handler, "__func__", handler)
+        try:
+            histogram = self.handlers[key]
+        except KeyError:
+            histogram = self.handlers[key] = Histogram()
+            self._names[key] = _handlerName(handler)
+        histogram.record(int(elapsed * 1000000))
+
+    def resumed(self, event, elapsed):
+        try:
+            histogram = self.tasks[event.name]
+        except KeyError:
+            histogram = self.tasks[event.name] = Histogram()
+        histogram.record(int(elapsed * 1000000))
+
+    def flushed(self, queued, batch):
+        self.queue.record(queued)
+        self.batch.record(batch)
+
+    def snapshot(self, reset=False):
+        """Return the statistics recorded so far
+
+        The result is a dict with these keys:
+
+        - ``"time"``: the number of seconds covered
+        - ``"sample"``: the sampling rate
+        - ``"events"``: a dict mapping event names to the number of
+          events fired
+        - ``"handlers"``: a dict mapping handler names to a summary of
+          their latencies in seconds, see :meth:`Histogram.snapshot`
+        - ``"tasks"``: the same for resuming the generator handlers of
+          each event name
+        - ``"queue"``: a summary of the number of queued events when
+          the queue is flushed
+        - ``"batch"``: a summary of the number of events dispatched by
+          each flush
+
+        :param reset: discard the statistics afterwards.
+        """
+
+        handlers = {}
+        for key, histogram in self.handlers.items():
+            name = self._names[key]
+            if name in handlers:
+                # Handlers defined with the same name elsewhere
+                histogram, other = Histogram(), histogram
+                histogram.merge(handlers[name])
+                histogram.merge(other)
+            handlers[name] = histogram
+
+        result = {
+            "time": time() - self.started,
+            "sample": self.sample,
+            "events": dict(self.events),
+            "handlers": dict(
+                (name, histogram.snapshot(1e-6))
+                for name, histogram in handlers.items()
+            ),
+            "tasks": dict(
+                (name, histogram.snapshot(1e-6))
+                for name, histogram in self.tasks.items()
+            ),
+            "queue": self.queue.snapshot(),
+            "batch": self.batch.snapshot(),
+        }
+
+        if reset:
+            self.reset()
+
+        return result
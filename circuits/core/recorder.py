@@ -0,0 +1,300 @@
+"""Flight Recorder
+
+This module defines the :class:`FlightRecorder` component, which keeps
+a trace of the recent events and handlers of a component tree in a
+ring buffer of fixed-size binary records. The trace is written to a
+file on demand, on a signal or when a handler fails, and can be
+analyzed with :mod:`circuits.tools.trace`.
+"""
+from json import dumps
+from signal import SIG_DFL, signal as set_signal_handler
+from struct import Struct, pack
+from threading import Lock, RLock, Thread
+from time import time
+
+from .components import BaseComponent
+from .handlers import handler, reprhandler
+from .profiler import clock
+
+try:
+    from signal import SIGUSR1
+except ImportError:
+    SIGUSR1 = None
+
+CAPACITY = 65536  # Number of records kept
+
+MAGIC = b"circuits-trace-1\n"
+
+# kind, time, event, cause, name, channels, handler, duration, queued
+RECORD = Struct("<BdIIHHHfI")
+
+FIRED = 0  # An event has been fired, cause is the event being handled
+HANDLED = 1  # A handler has returned
+RESUMED = 2  # A generator handler has been resumed
+
+_pack_into = RECORD.pack_into
+
+
+def _channelsName(channels):
+    return ",".join(
+        channel if isinstance(channel, str) else repr(channel)
+        for channel in channels
+    )
+
+
+class FlightRecorder(BaseComponent):
+
+    """Record the recent events and handlers of a component tree
+
+    Every fired event, handler call and generator handler resumption is
+    recorded with the time, the ids of the event, its name, channels and
+    handler, the duration and the number of queued events. Only the
+    last *capacity* records are kept.
+
+    The records are written to *path* by :meth:`dump`, which is called
+    when the process receives the signal *signo* and, if *errors* is
+    True, when a handler raises an exception (at most once a second).
+    The records are then written by a separate thread.
+
+    :param path: file the records are written to.
+    :type  path: str
+
+    :param capacity: number of records kept.
+    :type  capacity: int
+
+    :param signo: signal to dump the records on, None to not install a
+        signal handler. Signal handlers can only be installed if the
+        component is registered by the main thread.
+    :type  signo: int
+    """
+
+    channel = "recorder"
+
+    def __init__(self, path="circuits.trace", capacity=CAPACITY,
+                 signo=SIGUSR1, errors=True, channel=channel):
+        super(FlightRecorder, self).__init__(channel=channel)
+
+        self.path = path
+        self.capacity = capacity
+        self.signo = signo
+        self.errors = errors
+
+        self._buffer = bytearray(capacity * RECORD.size)
+        # Guards the counters below, events are fired by any thread
+        self._lock = Lock()
+        self._written = 0
+        self._serial = 0
+        self._root_queue = None
+
+        # Reentrant, dump may be called by a signal handler
+        self._ids_lock = RLock()
+        self._event_names, self._name_ids = [""], {}
+        self._channel_names, self._channel_ids = [""], {}
+        self._handler_names, self._handler_ids = [""], {}
+
+        self._installed = None
+        self._signal = False
+        self._previous = None
+        self._dumped = 0
+        self._writer = None
+
+    @handler("registered", channel="*")
+    def _on_registered(self, component, manager):
+        if self.root._recorder is not self:
+            self._uninstall()
+            self._install(self.root)
+
+    @handler("prepare_unregister", channel="*")
+    def _on_prepare_unregister(self, event, c):
+        if event.in_subtree(self):
+            self._uninstall()
+
+    def _install(self, root):
+        root._recorder = self
+        self._installed = root
+        self._root_queue = root._queue
+
+        if self.signo is not None:
+            try:
+                self._previous = set_signal_handler(
+                    self.signo, self._on_signal
+                )
+                self._signal = True
+            except ValueError:
+                # Not in the main thread
+                pass
+
+    def _uninstall(self):
+        root, self._installed = self._installed, None
+        if root is None:
+            return
+
+        if root._recorder is self:
+            root._recorder = None
+
+        if self._signal:
+            previous = self._previous
+            try:
+                set_signal_handler(
+                    self.signo, SIG_DFL if previous is None else previous
+                )
+            except ValueError:
+                pass
+            self._signal = False
+            self._previous = None
+
+    def _on_signal(self, signo, stack):
+        self.dump()
+
+    def _id(self, ids, table, key, name):
+        with self._ids_lock:
+            i = ids.get(key)
+            if i is None:
+                i = len(table)
+                if i > 0xFFFF:
+                    # Out of ids, recorded as unknown
+                    return 0
+                ids[key] = i
+                table.append(name(key))
+        return i
+
+    def _nameId(self, name):
+        return self._id(self._name_ids, self._event_names, name, str)
+
+    def _channelsId(self, channels):
+        return self._id(
+            self._channel_ids, self._channel_names, channels, _channelsName
+        )
+
+    def _handlerId(self, running):
+        return self._id(
+            self._handler_ids, self._handler_names, running, reprhandler
+        )
+
+    # The methods below are called by the manager for every event and
+    # handler, names are looked up inline and only added by the methods
+    # above. The number of queued events leaves out events posted by
+    # other threads that haven't been picked up yet.
+
+    def fired(self, event, cause):
+        with self._lock:
+            n = self._written
+            self._written = n + 1
+            serial = self._serial = (self._serial + 1) & 0xFFFFFFFF
+        event._recorded = serial
+
+        name, channels = event.name, event.channels
+        name = self._name_ids.get(name) or self._nameId(name)
+        channels = self._channel_ids.get(channels) or \
+            self._channelsId(channels)
+
+        # The handler firing the event, if any
+        running = getattr(cause, "handler", None)
+        if running is not None:
+            running = self._handler_ids.get(running) or \
+                self._handlerId(running)
+        cause = getattr(cause, "_recorded", 0)
+
+        queue = self._root_queue
+        _pack_into(
+            self._buffer, (n % self.capacity) * RECORD.size,
+            FIRED, clock(), serial, cause, name, channels, running or 0, 0,
+            len(queue._queue) + queue._flush_batch
+        )
+
+    def handled(self, event, running, started, elapsed):
+        with self._lock:
+            n = self._written
+            self._written = n + 1
+
+        name, channels = event.name, event.channels
+        name = self._name_ids.get(name) or self._nameId(name)
+        channels = self._channel_ids.get(channels) or \
+            self._channelsId(channels)
+        running = self._handler_ids.get(running) or self._handlerId(running)
+
+        queue = self._root_queue
+        _pack_into(
+            self._buffer, (n % self.capacity) * RECORD.size,
+            HANDLED, started, getattr(event, "_recorded", 0), 0, name,
+            channels, running, elapsed, len(queue._queue) + queue._flush_batch
+        )
+
+    def resumed(self, event, started, elapsed):
+        with self._lock:
+            n = self._written
+            self._written = n + 1
+
+        name = self._name_ids.get(event.name) or self._nameId(event.name)
+
+        queue = self._root_queue
+        _pack_into(
+            self._buffer, (n % self.capacity) * RECORD.size,
+            RESUMED, started, getattr(event, "_recorded", 0), 0, name, 0, 0,
+            elapsed, len(queue._queue) + queue._flush_batch
+        )
+
+    def failed(self, event):
+        # Called by the manager when a handler has raised an exception.
+        # The records are copied here and written by another thread, so
+        # the main loop doesn't wait for the file.
+        if self.errors and time() - self._dumped >= 1:
+            self._dumped = time()
+            self._writer = Thread(
+                target=self._write, args=(self.path, self._snapshot()),
+                name="%s-dump" % self.name
+            )
+            self._writer.daemon = True
+            self._writer.start()
+
+    def dump(self, path=None):
+        """Write the records kept to *path* (defaults to :attr:`path`)
+
+        The file starts with ``MAGIC``, followed by the length and the
+        JSON of a header with the name tables and the record format,
+        followed by the records from the oldest to the newest.
+
+        :returns: the path written to.
+        """
+
+        path = path or self.path
+        self._dumped = time()
+        self._write(path, self._snapshot())
+        return path
+
+    def _snapshot(self):
+        # Copy the records and the name tables
+        capacity, size = self.capacity, RECORD.size
+        with self._lock:
+            n = self._written
+            buffer = self._buffer
+            if n <= capacity:
+                data = bytes(buffer[:n * size])
+            else:
+                i = (n % capacity) * size
+                data = bytes(buffer[i:] + buffer[:i])
+
+        with self._ids_lock:
+            header = {
+                "format": RECORD.format if isinstance(RECORD.format, str)
+                else RECORD.format.decode("ascii"),
+                "time": time(),
+                "clock": clock(),
+                "records": len(data) // size,
+                "lost": max(0, n - capacity),
+                "names": list(self._event_names),
+                "channels": list(self._channel_names),
+                "handlers": list(self._handler_names),
+            }
+
+        return header, data
+
+    def _write(self, path, snapshot):
+        header, data = snapshot
+        header = dumps(header).encode("utf-8")
+
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(pack("<I", len(header)))
+            f.write(header)
+            f.write(data)
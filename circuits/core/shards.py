@@ -0,0 +1,308 @@
+"""Shards
+
+Shards runs a component tree in several processes, one root manager per
+core, so that a ``Server`` + ``HTTP`` + controllers tree can use more than
+one core without hand-rolled bridges.
+
+Each shard is created by calling *factory* with the shard's index in the
+child process. Listening TCP sockets are opened with ``SO_REUSEPORT``
+where the platform supports it, so the kernel spreads new connections
+over the shards. Events are sent to another shard with :class:`shard`,
+which consistently hashes a key (by default the channel) to one shard.
+
+The shards are connected to each other and to the parent by
+:class:`~.bridge.Bridge` instances. The parent aggregates the lifecycle
+of the shards into :class:`shards_started` and :class:`shards_stopped`
+and forwards ``signal`` events to them.
+"""
+from hashlib import md5
+from multiprocessing import Process, cpu_count
+from os import kill
+from signal import SIG_IGN, SIGINT, SIGTERM, signal as set_signal_handler
+from socket import socketpair
+from struct import unpack
+
+from ..six import b
+from .bridge import Bridge, ipc
+from .components import BaseComponent
+from .events import Event, signal
+from .handlers import handler
+from .manager import Manager
+from .pollers import Poller
+
+try:
+    from signal import SIGKILL
+except ImportError:
+    SIGKILL = SIGTERM
+
+TIMEOUT = 3.0  # Seconds to wait for a shard to exit
+
+
+def findshard(key, shards):
+    """Return the index of the shard *key* belongs to
+
+    Keys are hashed with a jump consistent hash, so the result is the
+    same in every process and only a small part of the keys move to
+    another shard when the number of shards changes.
+    """
+
+    h = unpack("<Q", md5(b(repr(key))).digest()[:8])[0]
+
+    i, j = -1, 0
+    while j < shards:
+        i = j
+        h = (h * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((i + 1) * (float(1 << 31) / float((h >> 33) + 1)))
+
+    return i
+
+
+class shard(Event):
+
+    """shard Event
+
+    Fire *event* on *channel* of the shard that *key* belongs to.
+
+    :param event: The event to fire.
+    :type  event: :class:`~.events.Event`
+
+    :param channel: The channel to fire the event on.
+    :type  channel: str
+
+    :param key: The routing key, defaults to *channel*.
+    :type  key: any object with a stable ``repr``
+    """
+
+    def __init__(self, event, channel, key=None):
+        super(shard, self).__init__(event, channel, key=key)
+
+
+class shards_started(Event):
+
+    """shards_started Event
+
+    This Event is sent when every shard has started.
+
+    :param shards: The number of shards.
+    :type  shards: int
+    """
+
+
+class shards_stopped(Event):
+
+    """shards_stopped Event
+
+    This Event is sent when every shard has stopped.
+
+    :param shards: The number of shards.
+    :type  shards: int
+    """
+
+
+class _shard_started(Event):
+
+    """_shard_started Event"""
+
+
+def _link(sock, channel):
+    from circuits.net.sockets import UNIXClient
+
+    client = UNIXClient(sock, channel=channel)
+    client._connected = True
+
+    return Bridge(client, channel=channel)
+
+
+class _Router(BaseComponent):
+
+    def _target(self, index):
+        return "shard-%d" % index
+
+    @handler("shard", channel="*")
+    def _on_shard(self, event, shard_event, channel, key=None):
+        index = findshard(channel if key is None else key, self.shards)
+        target = self._target(index)
+
+        if target is None:
+            value = yield self.call(shard_event, channel)
+        else:
+            value = yield self.call(ipc(shard_event, channel), target)
+
+        yield value.value
+
+
+class Shard(_Router):
+
+    """The side of a shard running in its child process"""
+
+    channel = "shard"
+
+    def init(self, index, shards, links, channel=channel):
+        self.index = index
+        self.shards = shards
+
+        for i, sock in enumerate(links):
+            if sock is not None:
+                _link(sock, self._target(i)).register(self)
+
+    def _target(self, index):
+        if index == self.index:
+            return None
+        elif index == self.shards:
+            return "shards"
+        return super(Shard, self)._target(index)
+
+    @handler("started", channel="*")
+    def _on_started(self, component):
+        if component is not self.root:
+            return
+
+        # The parent forwards signals to the shards
+        try:
+            set_signal_handler(SIGINT, SIG_IGN)
+        except ValueError:
+            pass
+
+        self.fire(ipc(_shard_started(self.index), "shards"), "shards")
+
+    @handler("disconnected", channel="shards")
+    def _on_disconnected(self):
+        self.root.stop()
+
+
+def _main(factory, index, shards, links, unused):
+    for sock in unused:
+        sock.close()
+
+    from circuits.net.sockets import TCPServer
+
+    try:
+        from socket import SO_REUSEPORT, SOL_SOCKET
+        option = (SOL_SOCKET, SO_REUSEPORT, 1)
+        TCPServer.socket_options = TCPServer.socket_options + [option]
+    except ImportError:
+        pass
+
+    root = Manager()
+    Poller().register(root)
+    Shard(index, shards, links).register(root)
+    factory(index).register(root)
+    root.run()
+
+
+class Shards(_Router):
+
+    """Run a component tree in several processes
+
+    :param factory: called with the index of a shard in its process and
+                    returns the component to register with its root.
+    :type  factory: callable
+
+    :param shards: number of shards, defaults to the number of cores.
+    :type  shards: int
+
+    If Shards is the root of its tree, it stops when every shard has
+    stopped after a ``SIGINT`` or ``SIGTERM`` signal. Otherwise the
+    ``shards_stopped`` event can be handled to do so.
+    """
+
+    channel = "shards"
+
+    def init(self, factory, shards=None, channel=channel):
+        self.factory = factory
+        self.shards = shards or cpu_count()
+
+        self._processes = []
+        self._links = set()
+        self._started = set()
+        self._stopping = False
+
+    @handler("registered", "started", channel="*")
+    def _on_registered_or_started(self, component, manager=None):
+        if self._processes:
+            return
+
+        if component is self.root or (
+                component is self and self.root.running):
+            self._spawn()
+
+    def _spawn(self):
+        n = self.shards
+
+        # links[i][j] is shard i's socket to shard j, j == n is the parent
+        links = [[None] * (n + 1) for _ in range(n + 1)]
+        for i in range(n + 1):
+            for j in range(i + 1, n + 1):
+                links[i][j], links[j][i] = socketpair()
+                links[i][j].setblocking(False)
+                links[j][i].setblocking(False)
+
+        for i in range(n):
+            unused = [
+                sock for k in range(n + 1) if k != i
+                for sock in links[k] if sock is not None
+            ]
+            process = Process(
+                target=_main, args=(self.factory, i, n, links[i], unused),
+                name="%s-%d" % (self.name, i)
+            )
+            process.start()
+            self._processes.append(process)
+
+        for i in range(n):
+            for sock in links[i]:
+                if sock is not None:
+                    sock.close()
+
+        for i, sock in enumerate(links[n][:n]):
+            _link(sock, self._target(i)).register(self)
+            self._links.add(self._target(i))
+
+    @handler("_shard_started")
+    def _on_shard_started(self, index):
+        self._started.add(index)
+        if len(self._started) == self.shards:
+            self.fire(shards_started(self.shards))
+            self.fire(ipc(shards_started(self.shards), "*"), *self._links)
+
+    @handler("signal", channel="*")
+    def _on_signal(self, signo, stack):
+        if signo in (SIGINT, SIGTERM):
+            self._stopping = True
+
+        for channel in self._links:
+            self.fire(ipc(signal(signo, None), "*"), channel)
+
+    @handler("disconnected", channel="*")
+    def _on_disconnected(self, event):
+        channel = event.channels[0] if event.channels else None
+        if channel not in self._links:
+            return
+
+        self._links.discard(channel)
+        if not self._links:
+            self._join(TIMEOUT)
+            self.fire(shards_stopped(self.shards))
+            if self._stopping and self.root is self:
+                self.stop()
+
+    @handler("stopped", channel="*")
+    def _on_stopped(self, component):
+        if component is self.root:
+            self._join(0)
+
+    @handler("prepare_unregister", channel="*")
+    def _on_prepare_unregister(self, event, c):
+        if event.in_subtree(self):
+            self._join(0)
+
+    def _join(self, timeout):
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join(TIMEOUT)
+
+            if process.is_alive():
+                kill(process.pid, SIGKILL)
+                process.join()
@@ -3,8 +3,6 @@
 from datetime import datetime
 from time import mktime, time
 
-from circuits.core.handlers import handler
-
 from .components import BaseComponent
 
 
@@ -14,6 +12,10 @@ class Timer(BaseComponent):
 
     A timer is a component that fires an event once after a certain
     delay or periodically at a regular interval.
+
+    Timers don't poll for their expiry. They are scheduled with the
+    root manager (see :meth:`~.manager.Manager.callAt`) which keeps all
+    pending timers of the component tree in a single heap.
     """
 
     def __init__(self, interval, event, *channels, **kwargs):
@@ -46,25 +48,42 @@ class Timer(BaseComponent):
 
         self.reset(interval)
 
-    @handler("generate_events")
-    def _on_generate_events(self, event):
-        if self.expiry is None:
-            return
+    def _on_expired(self):
+        self._handle = None
 
-        now = time()
+        if self.unregister_pending:
+            return
 
-        if now >= self.expiry:
-            if self.unregister_pending:
-                return
-            self.fire(self.event, *self.channels)
+        self.fire(self.event, *self.channels)
 
-            if self.persist:
-                self.reset()
-            else:
-                self.unregister()
-            event.reduce_time_left(0)
+        if self.persist:
+            self.reset()
         else:
-            event.reduce_time_left(self.expiry - now)
+            self.unregister()
+
+    def _schedule(self):
+        handle = getattr(self, "_handle", None)
+        if handle is not None:
+            handle.cancel()
+            self._handle = None
+
+        if self.expiry is not None and not self.unregister_pending:
+            self._handle = self.callAt(self.expiry, self._on_expired)
+
+    def _updateRoot(self, root):
+        super(Timer, self)._updateRoot(root)
+        handle = getattr(self, "_handle", None)
+        if handle is not None and handle._root is not root:
+            # Move the pending call to the new root's timers
+            self._schedule()
+
+    def unregister(self):
+        handle = getattr(self, "_handle", None)
+        if handle is not None:
+            handle.cancel()
+            self._handle = None
+
+        return super(Timer, self).unregister()
 
     def reset(self, interval=None):
         """
@@ -86,3 +105,4 @@ class Timer(BaseComponent):
     @expiry.setter
     def expiry(self, seconds):
         self._expiry = seconds
+        self._schedule()
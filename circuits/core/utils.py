@@ -17,9 +17,23 @@ def flatten(root, visited=None):
                 yield child
 
 
-def findchannel(root, channel, all=False):
-    components = [x for x in flatten(root)
-                  if x.channel == channel]
+def _insubtree(root, component):
+    while component is not root:
+        if component.parent is component:
+            return False
+        component = component.parent
+    return True
+
+
+def _find(root, components, all):
+    # components are taken from the tree's index, keep those below root
+    if root.root is not root:
+        components = [x for x in components if _insubtree(root, x)]
+
+    if components and components[0] is not root and root in components:
+        # root comes first, as when walking the tree
+        components.remove(root)
+        components.insert(0, root)
 
     if all:
         return components
@@ -28,15 +42,24 @@ def findchannel(root, channel, all=False):
         return components[0]
 
 
-def findtype(root, component, all=False):
-    components = [x for x in flatten(root)
-                  if issubclass(type(x), component)]
+def findchannel(root, channel, all=False):
+    channels = root._componentIndex()[1]
+    components = [
+        x for x in list(channels.get(channel, ()))
+        if x.channel == channel
+    ]
 
-    if all:
-        return components
+    return _find(root, components, all)
 
-    if components:
-        return components[0]
+
+def findtype(root, component, all=False):
+    types = root._componentIndex()[0]
+    components = [
+        x for cls in list(types) if issubclass(cls, component)
+        for x in list(types.get(cls, ()))
+    ]
+
+    return _find(root, components, all)
 
 
 findcmp = findtype
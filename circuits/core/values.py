@@ -131,3 +131,54 @@ class Value(object):
         update(self, value)
 
     value = property(getValue, setValue, None, "Value of this Value")
+
+
+class _NullValue(Value):
+
+    """Value of events fired with ``forget`` set
+
+    A shared, immutable stand-in for :class:`Value` that is returned for
+    fire-and-forget events. Results set on it are discarded, so handler
+    return values are neither stored nor chained and no notifications are
+    sent.
+    """
+
+    __slots__ = ()
+
+    event = None
+    manager = None
+    notify = False
+    promise = False
+    result = False
+    errors = False
+    parent = None
+    handled = False
+    _value = None
+
+    def __init__(self):
+        pass
+
+    def __setattr__(self, name, value):
+        pass
+
+    def __reduce__(self):
+        return "_null_value"
+
+    def __repr__(self):
+        "x.__repr__() <==> repr(x)"
+
+        return "<Value (forgotten)>"
+
+    def inform(self, force=False):
+        pass
+
+    def getValue(self, recursive=True):
+        return None
+
+    def setValue(self, value):
+        pass
+
+    value = property(getValue, setValue, None, "Always None")
+
+
+_null_value = _NullValue()
@@ -0,0 +1,198 @@
+"""Watchdog
+
+This module defines the :class:`Watchdog` component, which detects
+handlers blocking the main loop of a component tree.
+"""
+from inspect import ismethod
+from sys import _current_frames
+from threading import Event as Flag, Thread
+from time import time
+from traceback import format_stack
+
+from .components import BaseComponent
+from .events import Event, generate_events
+from .handlers import handler, reprhandler
+from .profiler import Histogram
+
+
+class slow_handler(Event):
+
+    """slow_handler Event
+
+    This Event is sent by the :class:`Watchdog` when a handler has been
+    running for longer than the threshold. It is sent from the monitor
+    thread while the handler is still running, so it is dispatched once
+    the handler has returned.
+
+    :param handler: The handler, see :func:`~.handlers.reprhandler`, or
+        the resumed task or timer callback, see :func:`reprresumed`.
+    :type  handler: str
+
+    :param event: The event being handled, None for timer callbacks.
+    :type  event: :class:`~.events.Event`
+
+    :param elapsed: The number of seconds the handler has been running.
+    :type  elapsed: float
+
+    :param stack: The stack of the main loop's thread at that time.
+    :type  stack: list of str
+    """
+
+
+def reprresumed(resumed):
+    """
+    Return a string describing a task or timer callback, given as the
+    tuple of the generator or callback and the event it belongs to.
+    """
+
+    running, event = resumed
+    if event is not None:
+        return "<task[%s] (%s)>" % (
+            event.name, getattr(running, "__name__", repr(running))
+        )
+
+    if ismethod(running):
+        name = "%s.%s" % (
+            running.__self__.__class__.__name__, running.__name__
+        )
+    else:
+        name = getattr(running, "__name__", None) or repr(running)
+    return "<timer (%s)>" % name
+
+
+class Watchdog(BaseComponent):
+
+    """Detect handlers blocking the main loop
+
+    A monitor thread looks at the handler the root manager is running
+    every *threshold* / 4 seconds. A handler still running after
+    *threshold* seconds is reported by a :class:`slow_handler` event
+    and counted in :attr:`slow`. So are resumed tasks (handlers that
+    are generators or coroutines) and timer callbacks. The
+    ``generate_events`` handlers, which wait for I/O by design, are not
+    monitored.
+
+    Every *interval* seconds, the delay of a timer scheduled by the
+    main loop is recorded in :attr:`lag`.
+
+    :ivar slow: dict mapping handlers (see
+        :func:`~.handlers.reprhandler`) to the number of times they have
+        been slow.
+    :ivar lag: :class:`~.profiler.Histogram` of the loop lag in
+        microseconds.
+
+    :param threshold: seconds a handler may run.
+    :type  threshold: float
+
+    :param interval: seconds between loop lag measurements.
+    :type  interval: float
+    """
+
+    channel = "watchdog"
+
+    def __init__(self, threshold=0.1, interval=1.0, channel=channel):
+        super(Watchdog, self).__init__(channel=channel)
+
+        self.threshold = threshold
+        self.interval = interval
+
+        self.slow = {}
+        self.lag = Histogram()
+
+        self._thread = None
+        self._stop = Flag()
+        self._timer = None
+
+    @handler("registered", "started", channel="*")
+    def _on_registered_or_started(self, component, manager=None):
+        if self._thread is not None:
+            return
+
+        if component is self.root or (
+                component is self and self.root.running):
+            self._stop.clear()
+            self._thread = Thread(
+                target=self._monitor, name="%s-monitor" % self.name
+            )
+            self._thread.daemon = True
+            self._thread.start()
+            self._schedule()
+
+    @handler("stopped", channel="*")
+    def _on_stopped(self, component):
+        if component is self.root:
+            self._shutdown()
+
+    @handler("prepare_unregister", channel="*")
+    def _on_prepare_unregister(self, event, c):
+        if event.in_subtree(self):
+            self._shutdown()
+
+    def _shutdown(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _schedule(self):
+        when = time() + self.interval
+        self._timer = self.root.callAt(when, self._measure, when)
+
+    def _measure(self, when):
+        self.lag.record(int((time() - when) * 1000000))
+        self._schedule()
+
+    def snapshot(self):
+        """Return the loop lag in seconds and the slow handlers"""
+
+        return {"lag": self.lag.snapshot(1e-6), "slow": dict(self.slow)}
+
+    def _monitor(self):
+        root = self.root
+        check = self.threshold / 4.0
+
+        # The handler (or resumed task or timer callback) running, the
+        # event handled, since when and whether it has been reported
+        running = event = None
+        started = 0
+        reported = False
+
+        while not self._stop.wait(check):
+            handling = root._currently_handling
+            if handling is not None and \
+                    not isinstance(handling, generate_events):
+                current, handled = handling.handler, handling
+            else:
+                # Tasks and timers run between flushes. The tuple is
+                # new every time one is run.
+                current, handled = root._currently_resuming, None
+                if current is None:
+                    running = event = None
+                    continue
+
+            now = time()
+            if handled is not event or current is not running:
+                running, event = current, handled
+                started = now
+                reported = False
+            elif not reported and now - started >= self.threshold:
+                reported = True
+                self._report(running, event, now - started)
+
+    def _report(self, running, event, elapsed):
+        root = self.root
+        th = root._executing_thread or root._flushing_thread
+        frame = _current_frames().get(th.ident) if th is not None else None
+        stack = format_stack(frame) if frame is not None else []
+
+        if event is None:
+            # A resumed task or a timer callback
+            name, event = reprresumed(running), running[1]
+        else:
+            name = reprhandler(running)
+        self.slow[name] = self.slow.get(name, 0) + 1
+        self.fire(slow_handler(name, event, elapsed, stack))
@@ -7,15 +7,36 @@ to create a pool of workers using sub-processes for CPU-bound work or `False`
 
 Then fire `task()` events with a function and *args and **kwargs to pass
 to the function when called from within the workers.
+
+With `executor=True` the pool is a :mod:`concurrent.futures` executor
+instead, which allows pending tasks to be cancelled. The number of pending
+tasks can be limited with `max_pending` and tasks can be given a deadline
+with `timeout` in either case.
+
+Process pools pickle the arguments and results of tasks. With
+`shm_threshold` large buffers are placed in
+:mod:`multiprocessing.shared_memory` blocks instead and only a reference
+to them is passed.
 """
+from collections import OrderedDict, deque
+import os
 from multiprocessing import Pool as ProcessPool, cpu_count
 from multiprocessing.pool import ThreadPool
+from sys import modules
 from threading import current_thread
+from time import time
 from weakref import WeakKeyDictionary
 
+from circuits.six.moves.queue import Full
+from circuits.tools import tryimport
+
 from .components import BaseComponent
 from .events import Event
 from .handlers import handler
+from .manager import Future, TimeoutError
+
+futures = tryimport("concurrent.futures", "futures")
+shared_memory = tryimport("multiprocessing.shared_memory", "shared_memory")
 
 DEFAULT_WORKERS = 10
 
@@ -34,10 +55,14 @@ class task(Event):
 
     :param kwargs: Keyword Arguments to pass to the function
     :type  kwargs: dict
+
+    :var timeout: deadline for the task in seconds, overrides the
+                  Worker's *timeout* if not ``None``.
     """
 
     success = True
     failure = True
+    timeout = None
 
     def __init__(self, f, *args, **kwargs):
         "x.__init__(...) initializes x; see x.__class__.__doc__ for signature"
@@ -45,6 +70,158 @@ class task(Event):
         super(task, self).__init__(f, *args, **kwargs)
 
 
+class _result(Event):
+
+    """_result Event"""
+
+    forget = True
+
+
+class _SharedRef(object):
+
+    # A buffer placed in a shared memory block. It is passed to or from
+    # the pool instead of the buffer.
+
+    __slots__ = ("name", "offset", "length", "kind", "meta")
+
+    def __init__(self, name, offset, length, kind, meta=None):
+        self.name = name
+        self.offset = offset
+        self.length = length
+        self.kind = kind
+        self.meta = meta
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+
+def _share(value, threshold):
+    # Copies value to a new shared memory block if it is a buffer of at
+    # least threshold bytes. Returns the block (or None) and a reference
+    # to it (or value).
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        kind, meta = type(value).__name__, None
+    else:
+        numpy = modules.get("numpy")
+        if numpy is None or not isinstance(value, numpy.ndarray) \
+                or value.dtype.hasobject:
+            return None, value
+        kind, meta = "ndarray", (value.dtype.str, value.shape)
+
+    view = memoryview(value)
+    if not view.nbytes or view.nbytes < threshold:
+        return None, value
+    if not view.c_contiguous:
+        view = memoryview(view.tobytes())
+
+    shm = shared_memory.SharedMemory(create=True, size=view.nbytes)
+    shm.buf[:view.nbytes] = view.cast("B")
+    return shm, _SharedRef(shm.name, 0, view.nbytes, kind, meta)
+
+
+def _load(ref, view, copy=True):
+    # Returns the buffer ref refers to from a view of its block. Without
+    # copy memoryviews and arrays are returned as views of the block.
+    if ref.kind == "bytes":
+        return bytes(view)
+    if ref.kind == "bytearray":
+        return bytearray(view)
+    if ref.kind == "memoryview":
+        return memoryview(bytes(view)) if copy else view
+
+    import numpy
+    dtype, shape = ref.meta
+    array = numpy.ndarray(shape, dtype, buffer=view)
+    return array.copy() if copy else array
+
+
+def _receive(ref):
+    # Loads a result from its block and frees the block
+    shm = shared_memory.SharedMemory(ref.name)
+    try:
+        view = shm.buf[ref.offset:ref.offset + ref.length]
+        value = _load(ref, view)
+        view.release()
+    finally:
+        shm.close()
+        shm.unlink()
+    return value
+
+
+def _run(f, args, kwargs, threshold=None):
+    # Runs in the pool. Arguments passed in shared memory are attached
+    # to, a large result is placed in a block of its own.
+    if threshold is None:
+        return f(*args, **kwargs)
+
+    blocks, views = [], []
+
+    def attach(value):
+        if not isinstance(value, _SharedRef):
+            return value
+        shm = shared_memory.SharedMemory(value.name)
+        blocks.append(shm)
+        views.append(shm.buf[value.offset:value.offset + value.length])
+        return _load(value, views[-1], copy=False)
+
+    try:
+        args = [attach(arg) for arg in args]
+        kwargs = dict((k, attach(v)) for k, v in kwargs.items())
+        shm, result = _share(f(*args, **kwargs), threshold)
+        if shm is not None:
+            shm.close()
+        return result
+    finally:
+        del args, kwargs
+        for view in views:
+            try:
+                view.release()
+            except BufferError:
+                pass  # Still referenced by the function's result
+        for shm in blocks:
+            try:
+                shm.close()
+            except BufferError:
+                pass  # Unmapped when the last reference is gone
+
+
+def _call(f, args, kwargs, threshold=None):
+    # Runs in the pool. Failures are returned rather than raised, so
+    # that a single callback reports both outcomes.
+    try:
+        return True, _run(f, args, kwargs, threshold)
+    except Exception as e:
+        return False, e
+
+
+class _Block(object):
+
+    __slots__ = ("shm", "ref", "value", "refs")
+
+    def __init__(self, shm, ref, value):
+        self.shm = shm
+        self.ref = ref
+        self.value = value
+        self.refs = 0
+
+
+class _Job(object):
+
+    __slots__ = ("call", "result", "future", "accepted", "timer", "blocks")
+
+    def __init__(self, call):
+        self.call = call
+        self.result = Future()
+        self.future = None
+        self.accepted = time()
+        self.timer = None
+        self.blocks = []
+
+
 class Worker(BaseComponent):
 
     """A thread/process Worker Component
@@ -59,29 +236,289 @@ class Worker(BaseComponent):
 
     :param process: True to start this Worker as a process (Thread otherwise)
     :type process: bool
+
+    :param executor: True to use a :mod:`concurrent.futures` executor
+                     as pool, which allows tasks that haven't been started
+                     to be cancelled.
+    :type executor: bool
+
+    :param max_pending: the maximum number of tasks submitted to the pool
+                        and not done yet (``None`` for no limit).
+    :type max_pending: int
+
+    :param overflow: what to do with a task if *max_pending* tasks are
+                     pending. ``"reject"`` fails the task with
+                     :class:`queue.Full`. ``"block"`` keeps the task (and
+                     a handler waiting for it) back until a pending task is
+                     done. ``"drop"`` cancels the oldest pending task that
+                     hasn't been started (it fails with
+                     :class:`concurrent.futures.CancelledError`) and
+                     rejects the task if there is none.
+    :type overflow: str
+
+    :param timeout: deadline for tasks in seconds. A task that isn't done
+                    in time fails with :class:`~.manager.TimeoutError` and
+                    is cancelled if it hasn't been started.
+    :type timeout: float
+
+    :param shm_threshold: the minimum size in bytes of ``bytes``,
+                          ``bytearray``, ``memoryview`` and ``numpy``
+                          array arguments and results that are passed
+                          in shared memory instead of being pickled
+                          (``None`` to pickle all). Requires
+                          *process* to be True. In the pool, memoryviews
+                          and arrays are views of the shared memory
+                          that are valid until the function returns.
+    :type shm_threshold: int
     """
 
     channel = "worker"
 
-    def init(self, process=False, workers=None, channel=channel):
+    def init(self, process=False, workers=None, channel=channel,
+             executor=False, max_pending=None, overflow="reject",
+             timeout=None, shm_threshold=None):
         if not hasattr(current_thread(), "_children"):
             current_thread()._children = WeakKeyDictionary()
 
+        if overflow not in ("reject", "block", "drop"):
+            raise ValueError("overflow must be 'reject', 'block' or 'drop'")
+
+        if shm_threshold is not None:
+            if not process:
+                raise ValueError("shm_threshold requires process=True")
+            if shared_memory is None:
+                raise RuntimeError("No shared memory support available")
+            if os.name == "posix":
+                # Started before the pool, so that the pool's processes
+                # don't start resource trackers of their own, which
+                # would unlink blocks when a process exits.
+                from multiprocessing.resource_tracker import ensure_running
+                ensure_running()
+
         self.workers = workers or (cpu_count() if process else DEFAULT_WORKERS)
-        Pool = ProcessPool if process else ThreadPool
-        self.pool = Pool(self.workers)
+        self.executor = executor
+        if executor:
+            if futures is None:
+                raise RuntimeError("No concurrent.futures support available")
+            Executor = futures.ProcessPoolExecutor if process \
+                else futures.ThreadPoolExecutor
+            self.pool = Executor(self.workers)
+        else:
+            Pool = ProcessPool if process else ThreadPool
+            self.pool = Pool(self.workers)
+
+        self.max_pending = max_pending
+        self.overflow = overflow
+        self.timeout = timeout
+        self.shm_threshold = shm_threshold
+
+        # Shared memory blocks of bytes arguments by id(), shared by
+        # the pending tasks that are passed the same object
+        self._blocks = {}
+
+        # Jobs submitted to the pool, oldest first
+        self._pending = OrderedDict()
+        # Jobs kept back by overflow="block"
+        self._blocked = deque()
+
+        self._counts = dict.fromkeys(
+            ("completed", "rejected", "dropped", "timedout"), 0
+        )
+        self._latency = 0.0
+        self._max_latency = 0.0
 
     @handler("stopped", "unregistered", channel="*")
     def _on_stopped(self, event, *args):
         if event.name == "unregistered" and args[0] is not self:
             return
 
-        self.pool.close()
-        self.pool.join()
+        if self.executor:
+            self.pool.shutdown()
+        else:
+            self.pool.close()
+            self.pool.join()
+
+        for job in self._pending:
+            self._unshare(job)
 
     @handler("task")
-    def _on_task(self, f, *args, **kwargs):
-        result = self.pool.apply_async(f, args, kwargs)
-        while not result.ready():
-            yield
-        yield result.get()
+    def _on_task(self, event, f, *args, **kwargs):
+        job = _Job((f, args, kwargs))
+
+        if self.max_pending is None or len(self._pending) < self.max_pending:
+            self._submit(job)
+        elif self.overflow == "block":
+            self._blocked.append(job)
+        elif self.overflow == "drop" and self._dropOldest():
+            self._submit(job)
+        else:
+            self._counts["rejected"] += 1
+            raise Full("%d tasks pending" % len(self._pending))
+
+        timeout = getattr(event, "timeout", None)
+        if timeout is None:
+            timeout = self.timeout
+        if timeout is not None:
+            job.timer = self.callLater(timeout, self._expire, job)
+
+        # The task is suspended until the job is done
+        yield job.result
+        yield job.result.result()
+
+    @handler("_result")
+    def _on_result(self, job, success, value):
+        if job not in self._pending:
+            return  # Cancelled
+
+        del self._pending[job]
+        self._unshare(job)
+
+        latency = time() - job.accepted
+        self._counts["completed"] += 1
+        self._latency += latency
+        self._max_latency = max(self._max_latency, latency)
+
+        if job.timer is not None:
+            job.timer.cancel()
+
+        if success:
+            job.result.setResult(value)
+        else:
+            job.result.setException(
+                (type(value), value, getattr(value, "__traceback__", None))
+            )
+
+        self._release()
+
+    def _submit(self, job):
+        self._pending[job] = None
+
+        f, args, kwargs = job.call
+        threshold = self.shm_threshold
+        if threshold is not None:
+            args = tuple(self._share(job, arg) for arg in args)
+            kwargs = dict((k, self._share(job, v)) for k, v in kwargs.items())
+
+        def deliver(success, value):
+            if success and isinstance(value, _SharedRef):
+                value = _receive(value)
+            self.fire(_result(job, success, value), self.channel)
+
+        if self.executor:
+            def callback(future):
+                # Invoked by a thread of the executor (or by cancel()).
+                # The event is passed to the manager's thread through
+                # its inbox.
+                if future.cancelled():
+                    return
+                error = future.exception()
+                if error is None:
+                    deliver(True, future.result())
+                else:
+                    deliver(False, error)
+
+            if threshold is None:
+                job.future = self.pool.submit(f, *args, **kwargs)
+            else:
+                job.future = self.pool.submit(
+                    _run, f, args, kwargs, threshold
+                )
+            job.future.add_done_callback(callback)
+        else:
+            def callback(result):
+                # Invoked by the pool's result thread, the event is
+                # passed to the manager's thread through its inbox.
+                deliver(*result)
+
+            job.future = self.pool.apply_async(
+                _call, (f, args, kwargs, threshold), callback=callback
+            )
+
+        job.call = None
+
+    def _share(self, job, value):
+        block = self._blocks.get(id(value))
+        if block is None:
+            shm, ref = _share(value, self.shm_threshold)
+            if shm is None:
+                return value
+            block = _Block(shm, ref, value)
+            if isinstance(value, bytes):
+                # Other buffers may be modified before they are passed
+                # again, so only bytes are shared between tasks.
+                self._blocks[id(value)] = block
+
+        block.refs += 1
+        job.blocks.append(block)
+        return block.ref
+
+    def _unshare(self, job):
+        for block in job.blocks:
+            block.refs -= 1
+            if not block.refs:
+                if self._blocks.get(id(block.value)) is block:
+                    del self._blocks[id(block.value)]
+                block.shm.close()
+                block.shm.unlink()
+        del job.blocks[:]
+
+    def _release(self):
+        while self._blocked and len(self._pending) < self.max_pending:
+            self._submit(self._blocked.popleft())
+
+    def _cancel(self, job):
+        # Only a task of an executor that hasn't been started can be
+        # cancelled, multiprocessing pools don't support cancellation.
+        if self.executor and job.future.cancel():
+            del self._pending[job]
+            self._unshare(job)
+            if job.timer is not None:
+                job.timer.cancel()
+            return True
+        return False
+
+    def _dropOldest(self):
+        for job in self._pending:
+            if self._cancel(job):
+                break
+        else:
+            return False
+
+        self._counts["dropped"] += 1
+        job.result.setException(
+            (futures.CancelledError, futures.CancelledError(), None)
+        )
+        return True
+
+    def _expire(self, job):
+        job.timer = None
+        self._counts["timedout"] += 1
+
+        if job in self._pending:
+            if self._cancel(job):
+                self._release()
+        else:
+            self._blocked.remove(job)
+
+        job.result.setException((TimeoutError, TimeoutError(), None))
+
+    def stats(self):
+        """
+        Return a dict with the number of tasks that are *pending* (submitted
+        to the pool and not done), *blocked* (waiting for a pending task to
+        be done), *completed*, *rejected*, *dropped* and *timedout*. The
+        mean and maximum time in seconds from accepting to completing a
+        task are given as *latency* and *max_latency*.
+        """
+
+        stats = dict(self._counts)
+        stats.update(
+            pending=len(self._pending),
+            blocked=len(self._blocked),
+            latency=(
+                self._latency / stats["completed"]
+                if stats["completed"] else 0.0
+            ),
+            max_latency=self._max_latency,
+        )
+        return stats
@@ -54,6 +54,8 @@ class Process(BaseComponent):
         self._stderr_closed_handler = None
         self._stdout_closed_handler = None
 
+        self._source = None
+
     def start(self):
         self.p = Popen(
             self.args,
@@ -98,18 +100,29 @@ class Process(BaseComponent):
 
         self._stderr_closed_handler = self.addHandler(
             handler("closed", channel=self._stderr.channel)(
-                lambda self: setattr(self, '_stderr_closed', True)
+                lambda self: self._closed("_stderr_closed")
             )
         )
 
         self._stdout_closed_handler = self.addHandler(
             handler("closed", channel=self._stdout.channel)(
-                lambda self: setattr(self, '_stdout_closed', True)
+                lambda self: self._closed("_stdout_closed")
             )
         )
 
+        if self._source is not None:
+            self._source.remove()
+        self._source = self.addSource(self._poll)
+
         self.fire(started(self))
 
+    def unregister(self):
+        if self._source is not None:
+            self._source.remove()
+            self._source = None
+
+        return super(Process, self).unregister()
+
     def stop(self):
         if self.p is not None:
             self.p.terminate()
@@ -131,23 +144,28 @@ class Process(BaseComponent):
         if getattr(self, "p", None) is not None:
             return self.p.poll()
 
-    @handler("generate_events")
-    def _on_generate_events(self, event):
-        if self.p is not None and self._status is None:
+    def _closed(self, attr):
+        setattr(self, attr, True)
+        if self._source is not None:
+            self._source.wakeup(0)
+
+    def _poll(self):
+        if self._status is None:
             self._status = self.p.poll()
 
-        if self._status is not None and self._stderr_closed \
-                and self._stdout_closed and not self._terminated:
-            self._terminated = True
-            self.removeHandler(self._stderr_read_handler)
-            self.removeHandler(self._stdout_read_handler)
-            self.removeHandler(self._stderr_closed_handler)
-            self.removeHandler(self._stdout_closed_handler)
-
-            self.fire(terminated(self))
-            self.fire(close(), self._stdin.channel, self._stdout.channel, self._stderr.channel)
-
-            event.reduce_time_left(0)
-            event.stop()
-        else:
-            event.reduce_time_left(TIMEOUT)
+        if self._status is None or not (
+                self._stderr_closed and self._stdout_closed):
+            return TIMEOUT
+
+        self._source = None
+        if self._terminated:
+            return
+
+        self._terminated = True
+        self.removeHandler(self._stderr_read_handler)
+        self.removeHandler(self._stdout_read_handler)
+        self.removeHandler(self._stderr_closed_handler)
+        self.removeHandler(self._stdout_closed_handler)
+
+        self.fire(terminated(self))
+        self.fire(close(), self._stdin.channel, self._stdout.channel, self._stderr.channel)
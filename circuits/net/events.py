@@ -180,6 +180,8 @@ class write(Event):
     :type  tuple: tuple
     """
 
+    forget = True
+
     def __init__(self, *args):
         "x.__init__(...) initializes x; see x.__class__.__doc__ for signature"
 
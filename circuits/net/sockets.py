@@ -108,6 +108,7 @@ class Client(BaseComponent):
         self._buffer = deque()
         self._closeflag = False
         self._connected = False
+        self._paused = False
 
         self.host = None
         self.port = 0
@@ -144,6 +145,21 @@ class Client(BaseComponent):
     def _on_stopped(self, component):
         self.fire(close())
 
+    @handler("queue_high", channel="*")
+    def _on_queue_high(self, queued):
+        # Stop reading until the manager has caught up
+        if self._poller is not None and self._connected and \
+                self._poller.isReading(self._sock):
+            self._poller.removeReader(self._sock)
+            self._paused = True
+
+    @handler("queue_low", channel="*")
+    def _on_queue_low(self, queued):
+        if self._paused:
+            self._paused = False
+            if self._connected:
+                self._poller.addReader(self, self._sock)
+
     @handler("read_value_changed")
     def _on_read_value_changed(self, value):
         if isinstance(value, binary_type):
@@ -417,6 +433,7 @@ class Server(BaseComponent):
 
         self._closeq = []
         self._clients = []
+        self._paused = set()
         self._poller = None
         self._buffers = defaultdict(deque)
 
@@ -484,6 +501,23 @@ class Server(BaseComponent):
     def _on_stopped(self, component):
         self.fire(close())
 
+    @handler("queue_high", channel="*")
+    def _on_queue_high(self, queued):
+        # Stop accepting and reading until the manager has caught up
+        if self._poller is None:
+            return
+
+        for sock in [self._sock] + self._clients:
+            if sock is not None and self._poller.isReading(sock):
+                self._poller.removeReader(sock)
+                self._paused.add(sock)
+
+    @handler("queue_low", channel="*")
+    def _on_queue_low(self, queued):
+        paused, self._paused = self._paused, set()
+        for sock in paused:
+            self._poller.addReader(self, sock)
+
     @handler("read_value_changed")
     def _on_read_value_changed(self, value):
         if isinstance(value.value, binary_type):
@@ -498,6 +532,7 @@ class Server(BaseComponent):
             return
 
         self._poller.discard(sock)
+        self._paused.discard(sock)
 
         if sock in self._buffers:
             del self._buffers[sock]
@@ -771,6 +806,7 @@ class UDPServer(Server):
 
     def _close(self, sock):
         self._poller.discard(sock)
+        self._paused.discard(sock)
 
         if sock in self._buffers:
             del self._buffers[sock]
@@ -1,5 +1,6 @@
 from circuits import Component, handler
 from circuits.core import Value
+from circuits.core.manager import Future
 from circuits.net.events import write
 
 from .utils import dump_event, dump_value, load_event, load_value
@@ -11,6 +12,7 @@ class Protocol(Component):
     __buffer = b''
     __nid = 0
     __events = {}
+    __finished = {}
 
     def init(self, sock=None, server=None, **kwargs):
         self.__server = server
@@ -54,8 +56,9 @@ class Protocol(Component):
 
             if not getattr(event, 'node_without_result', False):
                 self.__events[id] = event
-                while not hasattr(self.__events[id], 'remote_finish'):
-                    yield
+                # Parked until the result is received, not polled
+                finished = self.__finished[id] = Future()
+                yield finished
 
                 del (self.__events[id])
                 yield event.value
@@ -128,3 +131,7 @@ class Protocol(Component):
 
             for k, v in dict(meta).items():
                 setattr(self.__events[id], k, v)
+
+            finished = self.__finished.pop(id, None)
+            if finished is not None:
+                finished.setResult(True)
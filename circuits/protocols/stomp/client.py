@@ -8,6 +8,9 @@ import traceback
 
 from circuits import BaseComponent, Timer
 from circuits.core.handlers import handler
+from circuits.core.manager import TIMEOUT
+from circuits.core.pollers import BasePoller, Poller
+from circuits.core.utils import findcmp
 from circuits.protocols.stomp.events import (
     client_heartbeat, connected, connection_failed,
     disconnected, heartbeat_timeout, message, on_stomp_error, server_heartbeat,
@@ -93,6 +96,9 @@ class StompClient(BaseComponent):
         Stomp._transportFactory.proxy_password = proxy_password
         self._client = Stomp(self._stomp_config)
         self._subscribed = {}
+        self._source = None
+        self._poller = None
+        self._sock = None
         self.server_heartbeat = None
         self.client_heartbeat = None
         self.ALLOWANCE = 2  # multiplier for heartbeat timeouts
@@ -116,6 +122,7 @@ class StompClient(BaseComponent):
     def _disconnect(self, receipt=None):
         if self.connected:
             self._client.disconnect(receipt=receipt)
+        self._unwatch()
         self._client.close(flush=True)
         self.fire(disconnected(reconnect=False))
         self._subscribed = {}
@@ -164,6 +171,11 @@ class StompClient(BaseComponent):
                 LOG.info("Connected to %s", self._stomp_server)
                 self.fire(connected())
                 self.start_heartbeats()
+                self._watch()
+                if self._source is None:
+                    self._source = self.addSource(self._receive)
+                else:
+                    self._source.wakeup(0)
                 return "success"
 
         except StompConnectionError:
@@ -200,17 +212,47 @@ class StompClient(BaseComponent):
                 event.success = False
                 self.fire(disconnected())
 
-    @handler("generate_events")
-    def generate_events(self, event):
+    def _watch(self):
+        """ Wake up the receiving source when the socket becomes readable """
+        self._unwatch()
+        transport = getattr(self._client, "_transport", None)
+        sock = getattr(transport, "_socket", None)
+        if sock is None:
+            return
+        if self._poller is None:
+            self._poller = findcmp(self.root, BasePoller)
+            if self._poller is None:
+                self._poller = Poller().register(self)
+        self._sock = sock
+        self._poller.addReader(self, sock)
+
+    def _unwatch(self):
+        if self._sock is not None:
+            self._poller.discard(self._sock)
+            self._sock = None
+
+    @handler("_read")
+    def _on_read(self, sock):
+        if self._source is not None:
+            self._source.wakeup()
+
+    def _receive(self):
         if not self.connected:
+            self._unwatch()
             return
         try:
-            if self._client.canRead(1):
+            if self._client.canRead(0):
                 frame = self._client.receiveFrame()
                 LOG.debug("Recieved frame %s", frame)
                 self.fire(message(frame))
+                # Due again right away, after the events queued so far
+                return 0
         except StompConnectionError:
+            self._unwatch()
             self.fire(disconnected())
+            return
+        # Woken up by the poller, polled if there is no socket to watch
+        return None if self._sock is not None else TIMEOUT
 
     @handler("send")
     def send(self, event, destination, body, headers=None, receipt=None):
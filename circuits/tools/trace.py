@@ -0,0 +1,198 @@
+"""Trace
+
+Analyze the traces written by :class:`~circuits.core.recorder.FlightRecorder`::
+
+    python -m circuits.tools.trace circuits.trace
+
+prints the latencies of the handlers, the time events spent in the
+queue and the slowest handler calls with the chain of events that
+caused them.
+"""
+from __future__ import print_function
+
+from collections import namedtuple
+from json import loads
+from optparse import OptionParser
+from struct import Struct, unpack
+
+from circuits.core.profiler import Histogram
+from circuits.core.recorder import FIRED, HANDLED, MAGIC
+
+USAGE = "%prog [options] trace"
+
+# Times are in seconds since the epoch, durations in seconds. event and
+# cause are the ids of the event and, for fired events, of the event
+# being handled when it was fired (0 if none). handler is the handler
+# called or, for fired events, the handler that fired the event.
+Record = namedtuple(
+    "Record",
+    "kind time event cause name channels handler duration queued"
+)
+
+
+class Trace(object):
+
+    """A trace loaded by :func:`load`
+
+    :ivar records: list of :class:`Record` from the oldest to the newest.
+    :ivar lost: number of older records that have been overwritten.
+    """
+
+    def __init__(self, header, data):
+        record = Struct(str(header["format"]))
+        names = header["names"]
+        channels = header["channels"]
+        handlers = header["handlers"]
+
+        # Recorded times are relative to the clock at dump time
+        offset = header["time"] - header["clock"]
+
+        self.lost = header["lost"]
+        self.records = []
+        for i in range(header["records"]):
+            (kind, when, event, cause, name, channel, handler, duration,
+             queued) = record.unpack_from(data, i * record.size)
+            self.records.append(Record(
+                kind, when + offset, event, cause, names[name],
+                channels[channel], handlers[handler], duration, queued
+            ))
+
+        self.fired = dict(
+            (r.event, r) for r in self.records if r.kind == FIRED
+        )
+
+
+def load(path):
+    """Load the trace written to *path*"""
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    if not data.startswith(MAGIC):
+        raise ValueError("%s is not a circuits trace" % path)
+
+    i = len(MAGIC)
+    size = unpack("<I", data[i:i + 4])[0]
+    header = loads(data[i + 4:i + 4 + size].decode("utf-8"))
+
+    return Trace(header, data[i + 4 + size:])
+
+
+def handlers(trace):
+    """Return a dict mapping handlers to a summary of their latencies
+
+    See :meth:`~circuits.core.profiler.Histogram.snapshot`.
+    """
+
+    histograms = {}
+    for r in trace.records:
+        if r.kind == HANDLED:
+            if r.handler not in histograms:
+                histograms[r.handler] = Histogram()
+            histograms[r.handler].record(int(r.duration * 1e9))
+
+    return dict(
+        (name, histogram.snapshot(1e-9))
+        for name, histogram in histograms.items()
+    )
+
+
+def waits(trace):
+    """Return a dict mapping event names to a summary of the time
+    between firing an event and calling its first handler"""
+
+    histograms = {}
+    seen = set()
+    for r in trace.records:
+        if r.kind != HANDLED or r.event in seen or r.event not in trace.fired:
+            continue
+        seen.add(r.event)
+
+        if r.name not in histograms:
+            histograms[r.name] = Histogram()
+        wait = r.time - trace.fired[r.event].time
+        histograms[r.name].record(int(wait * 1e6))
+
+    return dict(
+        (name, histogram.snapshot(1e-6))
+        for name, histogram in histograms.items()
+    )
+
+
+def slowest(trace, n=10):
+    """Return the *n* slowest handler calls"""
+
+    calls = [r for r in trace.records if r.kind == HANDLED]
+    return sorted(calls, key=lambda r: r.duration, reverse=True)[:n]
+
+
+def chain(trace, event):
+    """Return the records of the events that caused *event*
+
+    The result starts with the oldest recorded cause and ends with the
+    record of *event* being fired. It is empty if that wasn't recorded.
+    """
+
+    result = []
+    seen = set()
+    r = trace.fired.get(event)
+    while r is not None and r.event not in seen:
+        seen.add(r.event)
+        result.append(r)
+        r = trace.fired.get(r.cause)
+
+    return result[::-1]
+
+
+def _table(title, summaries, n):
+    print("%s:" % title)
+    rows = sorted(
+        summaries.items(), key=lambda item: item[1]["total"], reverse=True
+    )
+    for name, s in rows[:n]:
+        print("  %12.1f us %8d x %10.1f us (p50) %10.1f us (p99) %10.1f us (max)  %s" % (
+            s["total"] * 1e6, s["count"], s["p50"] * 1e6, s["p99"] * 1e6,
+            s["max"] * 1e6, name))
+    print()
+
+
+def parse_options():
+    parser = OptionParser(usage=USAGE)
+
+    parser.add_option(
+        "-n", "--top",
+        action="store", type="int", default=10, dest="top",
+        help="Number of handlers, events and calls to print"
+    )
+
+    opts, args = parser.parse_args()
+
+    if len(args) != 1:
+        parser.print_help()
+        raise SystemExit(1)
+
+    return opts, args
+
+
+def main():
+    opts, args = parse_options()
+
+    trace = load(args[0])
+    print("%d records, %d lost" % (len(trace.records), trace.lost))
+    print()
+
+    _table("Handlers", handlers(trace), opts.top)
+    _table("Queued", waits(trace), opts.top)
+
+    print("Slowest:")
+    for r in slowest(trace, opts.top):
+        print("  %10.1f us %s %s (%d queued)" % (
+            r.duration * 1e6, r.handler, r.name, r.queued))
+        for cause in reversed(chain(trace, r.event)):
+            print("    <- %s[%s] fired by %s" % (
+                cause.name, cause.channels, cause.handler or "-"))
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""Bench Test Suite
+
+Test the benchmark scenarios and the comparison of their results.
+"""
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+import json
+
+import pytest
+
+from circuits.bench import SCENARIOS, compare, run, scenarios
+from circuits.bench.base import Scenario, measure
+from circuits.bench.core import Fire, Threads
+
+
+class Failing(Scenario):
+
+    name = "failing"
+
+    def setup(self):
+        raise ImportError("No module named foo")
+
+
+def test_measure():
+    result = measure(Fire, 5)
+    assert result["name"] == "fire"
+    assert result["ops"] == 5 * Fire.events
+    assert result["rate"] > 0
+
+    latency = result["latency"]
+    assert 0 < latency["p50"] <= latency["p99"] <= latency["max"]
+
+
+def test_measure_threads():
+    result = measure(Threads, 2)
+    assert result["ops"] == 2 * Threads.threads * Threads.events
+
+
+def test_measure_error():
+    result = measure(Failing)
+    assert result == {"name": "failing", "error": "ImportError: No module named foo"}
+
+
+def test_run():
+    results = run(["fire", "call"], 2)
+    assert [r["name"] for r in results["results"]] == ["fire", "call"]
+    assert json.loads(json.dumps(results)) == results
+
+    with pytest.raises(ValueError):
+        scenarios(["foo"])
+    assert scenarios() == SCENARIOS
+
+
+def test_compare():
+    results = run(["fire", "create"], 2)
+    assert compare(results, results) == []
+
+    baseline = json.loads(json.dumps(results))
+    fire = baseline["results"][0]
+    fire["rate"] *= 2
+    fire["latency"]["p99"] /= 2
+
+    regressions = compare(results, baseline, 0.1)
+    assert [r[:2] for r in regressions] == [("fire", "rate"), ("fire", "p99")]
+    assert regressions[0][3] == fire["rate"]
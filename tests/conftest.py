@@ -11,6 +11,11 @@ import pytest
 from circuits import BaseComponent, Debugger, Manager, handler
 from circuits.core.manager import TIMEOUT
 
+collect_ignore = []
+if sys.version_info[:2] < (3, 5):
+    # async def is a syntax error
+    collect_ignore.append("core/test_coroutine_handlers.py")
+
 
 class Watcher(BaseComponent):
 
@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+import socket
+from time import time
+
+import pytest
+
+from circuits import Component, Event, Manager, Timer, handler
+from circuits.core.pollers import AsyncIO, Select
+
+asyncio = pytest.importorskip("asyncio")
+
+
+class hello(Event):
+
+    """hello Event"""
+
+    success = True
+
+
+class done(Event):
+
+    """done Event"""
+
+
+class App(Component):
+
+    def init(self, future):
+        self.future = future
+
+    def hello(self):
+        return "Hello World!"
+
+    def hello_success(self, e, value):
+        self.future.set_result(value)
+
+    def done(self, *args):
+        self.future.set_result(time())
+
+
+class Reader(Component):
+
+    channel = "reader"
+
+    def init(self, future):
+        self.future = future
+
+    @handler("_read")
+    def _on_read(self, sock):
+        self.future.set_result(sock.recv(1024))
+
+
+@pytest.fixture
+def loop(request):
+    loop = asyncio.new_event_loop()
+    request.addfinalizer(loop.close)
+    return loop
+
+
+def run(loop, manager, future, timeout=5.0):
+    manager.attach(loop)
+    try:
+        return loop.run_until_complete(asyncio.wait_for(future, timeout))
+    finally:
+        manager.stop()
+        loop.run_until_complete(asyncio.sleep(0.01))
+
+
+def test_fire(loop):
+    future = loop.create_future()
+    m = Manager()
+    App(future).register(m)
+    m.fire(hello())
+
+    assert run(loop, m, future) == "Hello World!"
+    assert m._loop is None
+    assert m._executing_thread is None
+
+
+def test_fire_from_loop(loop):
+    future = loop.create_future()
+    m = Manager()
+    App(future).register(m)
+    loop.call_later(0.05, m.fire, hello())
+
+    assert run(loop, m, future) == "Hello World!"
+
+
+def test_timer(loop):
+    future = loop.create_future()
+    m = Manager()
+    App(future).register(m)
+    start = time()
+    Timer(0.1, done()).register(m)
+
+    assert run(loop, m, future) - start >= 0.1
+
+
+def test_reader(loop):
+    future = loop.create_future()
+    m = Manager()
+    poller = AsyncIO(loop).register(m)
+    reader = Reader(future).register(m)
+
+    a, b = socket.socketpair()
+    a.setblocking(False)
+    poller.addReader(reader, a)
+    loop.call_later(0.05, b.send, b"hello")
+
+    try:
+        assert run(loop, m, future) == b"hello"
+    finally:
+        poller.discard(a)
+        a.close()
+        b.close()
+
+
+def test_blocking_poller(loop):
+    m = Manager()
+    Select().register(m)
+
+    with pytest.raises(TypeError):
+        m.attach(loop)
@@ -1,4 +1,6 @@
 #!/usr/bin/env python
+from time import time
+
 import pytest
 
 from circuits.core import Component, Event, TimeoutError, handler
@@ -22,6 +24,12 @@ class hello(Event):
     success = True
 
 
+class idle(Event):
+
+    """idle Event"""
+    success = True
+
+
 class App(Component):
 
     @handler('wait')
@@ -34,6 +42,13 @@ class App(Component):
         else:
             yield result
 
+    @handler('idle')
+    def _on_idle(self, timeout=-1):
+        try:
+            yield self.wait('never', timeout=timeout)
+        except TimeoutError as e:
+            yield e
+
     @handler('hello')
     def _on_hello(self):
         return 'hello'
@@ -96,3 +111,20 @@ def test_call_failure(manager, watcher, app):
     value = x.value
 
     assert isinstance(value, TimeoutError)
+
+
+def test_wait_deadline(manager, watcher, app):
+    handlers = set(app._handlers.get("generate_events", ()))
+
+    start = time()
+    x = manager.fire(idle(0.5))
+
+    # No per-call handler counts down the ticks
+    assert pytest.wait_for(manager, "_timers", lambda m, attr: any(
+        not t[2].cancelled for t in m._timers
+    ))
+    assert set(app._handlers.get("generate_events", ())) == handlers
+
+    assert watcher.wait('idle_success')
+    assert isinstance(x.value, TimeoutError)
+    assert time() - start >= 0.5
@@ -34,6 +34,14 @@ class Base(Component):
     channel = "base"
 
 
+class D(Component):
+
+    def __init__(self, *args, **kwargs):
+        # Components assigned before initialization are registered
+        self.a = A()
+        super(D, self).__init__(*args, **kwargs)
+
+
 class C(Base):
 
     channel = "c"
@@ -91,3 +99,33 @@ def test_subclassing_with_custom_channel():
     c = C()
 
     assert c.channel == "c"
+
+
+def test_instances():
+    d1 = D()
+    d2 = D()
+
+    assert d1.a in d1 and d1.a.parent is d1
+    assert d2.a in d2 and d2.a.parent is d2
+
+    # Handlers are bound to each instance
+    h1 = d1._handlers["prepare_unregister_complete"]
+    h2 = d2._handlers["prepare_unregister_complete"]
+    assert [h.__self__ for h in h1] == [d1]
+    assert [h.__self__ for h in h2] == [d2]
+
+
+def test_unregister_own():
+    m = Manager()
+    a1 = A().register(m)
+    a2 = A().register(m)
+    while len(m):
+        m.flush()
+
+    a1.unregister()
+    while len(m):
+        m.flush()
+
+    assert a1 not in m.components
+    assert a2 in m.components
+    assert a2.parent is m
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+from time import time
+
+import pytest
+
+from circuits import Component, Event, TimeoutError, Worker, handler, task
+from circuits.core.manager import sleep
+
+
+class hello(Event):
+
+    """hello Event"""
+
+    success = True
+
+
+class foo(Event):
+
+    """foo Event"""
+
+    success = True
+
+
+class nap(Event):
+
+    """nap Event"""
+
+    success = True
+
+
+class fail(Event):
+
+    """fail Event"""
+
+    success = True
+    failure = True
+
+
+class compute(Event):
+
+    """compute Event"""
+
+    success = True
+
+
+class wait(Event):
+
+    """wait Event"""
+
+    success = True
+
+
+def f():
+    return 1000000
+
+
+class App(Component):
+
+    @handler("hello")
+    async def _on_hello(self):
+        return "Hello World!"
+
+    @handler("foo")
+    async def _on_foo(self):
+        value = await self.call(hello())
+        return value.value + " (called)"
+
+    @handler("nap")
+    async def _on_nap(self, seconds):
+        await sleep(seconds)
+        return "Good morning!"
+
+    @handler("fail")
+    async def _on_fail(self):
+        await sleep(0)
+        raise ValueError("failed")
+
+    @handler("compute")
+    async def _on_compute(self):
+        value = await self.call(task(f))
+        return value.value
+
+    @handler("wait")
+    async def _on_wait(self, timeout=-1):
+        try:
+            await self.wait("never", timeout=timeout)
+        except TimeoutError as e:
+            return e
+
+
+@pytest.fixture
+def app(request, manager, watcher):
+    app = App().register(manager)
+    assert watcher.wait("registered")
+
+    worker = Worker().register(manager)
+    assert watcher.wait("registered")
+
+    def finalizer():
+        app.unregister()
+        worker.unregister()
+
+    request.addfinalizer(finalizer)
+
+    return app
+
+
+def test_return_value(manager, watcher, app):
+    x = manager.fire(hello())
+    assert watcher.wait("hello_success")
+
+    assert x.value == "Hello World!"
+
+
+def test_call(manager, watcher, app):
+    x = manager.fire(foo())
+    assert watcher.wait("foo_success")
+
+    assert x.value == "Hello World! (called)"
+
+
+def test_call_without_done_handlers(manager, watcher, app):
+    x = manager.fire(foo())
+    assert watcher.wait("foo_success")
+
+    assert x.value == "Hello World! (called)"
+    # No hello_done event has been fired
+    assert "hello_done" not in manager._cache
+
+
+def test_sleep(manager, watcher, app):
+    start = time()
+    x = manager.fire(nap(0.1))
+    assert watcher.wait("nap_success")
+
+    assert x.value == "Good morning!"
+    assert time() - start >= 0.1
+
+
+def test_failure(manager, watcher, app):
+    x = manager.fire(fail())
+    assert watcher.wait("fail_failure")
+
+    assert x.errors
+    assert x.value[0] is ValueError
+
+
+def test_worker(manager, watcher, app):
+    x = manager.fire(compute())
+    assert watcher.wait("compute_success")
+
+    assert x.value == 1000000
+
+
+def test_wait_timeout(manager, watcher, app):
+    x = manager.fire(wait(0.1))
+    assert watcher.wait("wait_success")
+
+    assert isinstance(x.value, TimeoutError)
+
+
+def test_wait_timeout_handlers(manager, watcher, app):
+    for _ in range(5):
+        watcher.clear()
+        x = manager.fire(wait(0.01))
+        assert watcher.wait("wait_success")
+        assert isinstance(x.value, TimeoutError)
+
+    # The handlers waiting for the event have been removed
+    assert "never" not in app._handlers
@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 import pytest
 
-from circuits import Event, Manager, handler
+from circuits import Component, Event, Manager, handler
 
 
 class foo(Event):
@@ -55,3 +55,92 @@ def test_removeHandler():
     assert "foo" not in m._handlers
 
     m.stop()
+
+
+class bar(Event):
+
+    """bar Event"""
+
+
+@handler("bar")
+def on_bar(self):
+    return "Foobar!"
+
+
+def test_cache_update():
+    m = Manager()
+
+    m.addHandler(on_foo)
+    m.addHandler(on_bar)
+
+    x = m.fire(foo())
+    y = m.fire(bar())
+    m.flush()
+
+    assert x.value == "Hello World!"
+    assert y.value == "Foobar!"
+
+    bar_handlers = m._cache["bar"][("*",)]
+
+    # Only the entries of the affected event name are rebuilt
+    method = m.addHandler(handler("foo", priority=1)(lambda self: None))
+    x = m.fire(foo())
+    y = m.fire(bar())
+    m.flush()
+
+    assert m._cache["foo"][("*",)][0] == method
+    assert m._cache["bar"][("*",)] is bar_handlers
+    assert x.value == "Hello World!"
+
+    m.removeHandler(method)
+    x = m.fire(foo())
+    m.flush()
+
+    assert method not in m._cache["foo"][("*",)]
+    assert m._cache["bar"][("*",)] is bar_handlers
+    assert x.value == "Hello World!"
+
+
+class Leaf(Component):
+
+    def foo(self):
+        pass
+
+    @handler("bar", channel="*")
+    def _on_bar(self):
+        pass
+
+
+def test_handler_index():
+    m = Manager()
+    a = Leaf(channel="a").register(m)
+    b = Leaf(channel="b").register(a)
+    c = Leaf().register(m)
+    method = b.addHandler(handler(channel="b")(lambda self, *args: None))
+
+    def check():
+        while len(m):
+            m.flush()
+        for name in ("foo", "bar", "baz"):
+            for channel in ("*", "a", "b", "c", a, b, c):
+                e = Event.create(name)
+                assert m._resolveHandlers(name, channel) == \
+                    m.getHandlers(e, channel)
+
+    check()
+
+    b.removeHandler(method, "*")
+    b.unregister()
+    check()
+
+    b.register(m)
+    d = Leaf(channel="a").register(b)
+    check()
+
+    a.unregister()
+    d.unregister()
+    check()
+    assert not [
+        h for handlers in m._handler_names.values() for h in handlers
+        if h.__self__ in (a, d)
+    ]
@@ -1,5 +1,7 @@
 """Event Tests"""
 
+import pickle
+
 import py
 
 from circuits import Component, Event
@@ -10,6 +12,14 @@ class test(Event):
     """test Event"""
 
 
+class routed(Event):
+
+    """routed Event"""
+
+    channels = ("foo",)
+    success = True
+
+
 class App(Component):
 
     def test(self):
@@ -91,3 +101,51 @@ def test_subclass_looses_properties():
         success = True
     e = hello().child('success')
     assert e.success is False
+
+
+def test_create_reuses_class():
+    e1 = Event.create("hello", 1)
+    e2 = Event.create("hello", 2)
+
+    assert type(e1) is type(e2)
+    assert e1.args == [1] and e2.args == [2]
+
+    e3 = test.create("hello")
+    assert type(e3) is not type(e1)
+    assert isinstance(e3, test)
+
+    e4 = e1.child("done")
+    assert type(e4) is type(e2.child("done"))
+    assert e4.name == "hello_done"
+
+
+def test_channels():
+    e = test()
+    assert e.channels == ()
+
+    e = routed()
+    assert e.channels == ("foo",)
+
+    e.channels = ("bar",)
+    assert e.channels == ("bar",)
+    assert routed.channels == ("foo",)
+
+
+def test_pickle():
+    app = App()
+    while len(app):
+        app.flush()
+
+    e = routed(1, 2, foo="bar")
+    e.notify = True
+    app.fire(e, "baz")
+
+    x = pickle.loads(pickle.dumps(e, -1))
+
+    assert type(x) is routed
+    assert x.name == "routed"
+    assert x.args == [1, 2]
+    assert x.kwargs == {"foo": "bar"}
+    assert x.channels == ("baz",)
+    assert x.notify and x.success
+    assert x.handler is None
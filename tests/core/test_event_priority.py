@@ -46,3 +46,19 @@ def test2():
     app.run()
 
     assert app.results == [2, 1]
+
+
+def test3():
+    app = App()
+
+    # Priority Order, Normal Order for equal priorities
+    app.fire(foo(1))
+    app.fire(foo(2), priority=1)
+    app.fire(foo(3))
+    app.fire(foo(4), priority=-1)
+    app.fire(foo(5), priority=1)
+    app.fire(done(), priority=2)
+
+    app.run()
+
+    assert app.results == [4, 1, 3, 2, 5]
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+from circuits import Component, Event, Manager
+
+
+class foo(Event):
+
+    """foo Event"""
+
+
+class App(Component):
+
+    def init(self, results, channel=None):
+        self.results = results
+
+    def foo(self, value):
+        self.results.append(value)
+
+
+def flush(m):
+    rounds = []
+    while len(m):
+        m.flush()
+        rounds.append(list(m.results))
+        del m.results[:]
+    return rounds
+
+
+def setup(**kwargs):
+    m = Manager()
+    m.results = []
+    App(m.results, channel="a").register(m)
+    App(m.results, channel="b").register(m)
+    while len(m):
+        m.flush()
+    m.useFairQueue(**kwargs)
+    return m
+
+
+def test_round_robin():
+    m = setup(quantum=2)
+
+    for i in range(5):
+        m.fire(foo("a%d" % i), "a")
+    for i in range(2):
+        m.fire(foo("b%d" % i), "b")
+
+    assert len(m) == 7
+    assert flush(m) == [["a0", "a1", "b0", "b1"], ["a2", "a3"], ["a4"]]
+
+
+def test_weights():
+    m = setup(quantum=1, weights={("a",): 2})
+
+    for i in range(4):
+        m.fire(foo("a%d" % i), "a")
+        m.fire(foo("b%d" % i), "b")
+
+    assert flush(m) == [
+        ["a0", "a1", "b0"], ["a2", "a3", "b1"], ["b2"], ["b3"]
+    ]
+
+
+def test_key():
+    m = setup(quantum=1, key=lambda event, channels: event.args[0][0])
+
+    for value in ("x0", "x1", "y0", "x2", "y1"):
+        m.fire(foo(value), "a")
+
+    assert flush(m) == [["x0", "y0"], ["x1", "y1"], ["x2"]]
+
+
+def test_priority():
+    m = setup(quantum=2)
+
+    m.fire(foo("a0"), "a")
+    m.fire(foo("a1"), "a", priority=-1)
+    m.fire(foo("a2"), "a", priority=-1)
+    m.fire(foo("b0"), "b", priority=1)
+
+    # Ordered by priority within a round, fired order within a channel
+    assert flush(m) == [["a1", "a0", "b0"], ["a2"]]
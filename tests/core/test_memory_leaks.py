@@ -44,3 +44,26 @@ def test_done_handlers_dont_leak(manager, watcher, app):
     manager.fire(call())
     assert watcher.wait("call_success")
     assert "hello_done" not in app._handlers
+
+
+def test_create_doesnt_leak_classes():
+    Event.create("churn")
+    n = len(Event.__subclasses__())
+
+    for i in range(1000):
+        Event.create("churn").child("done")
+
+    assert len(Event.__subclasses__()) <= n + 1
+
+
+def test_create_is_bounded(monkeypatch):
+    from circuits.core import events
+
+    monkeypatch.setattr(events, "EVENT_CLASSES_MAX", 10)
+
+    for i in range(100):
+        Event.create("bounded_%d" % i)
+
+    names = [name for _, name in events._event_classes]
+    assert "bounded_99" in names
+    assert "bounded_0" not in names
@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+import pytest
+
+from circuits import Component, Event, Manager
+from circuits.core.profiler import Histogram
+
+
+class foo(Event):
+
+    """foo Event"""
+
+
+class bar(Event):
+
+    """bar Event"""
+
+
+class App(Component):
+
+    def init(self):
+        self.snapshots = []
+
+    def foo(self):
+        return "foo"
+
+    def bar(self):
+        yield
+        yield "bar"
+
+    def stats(self, snapshot):
+        self.snapshots.append(snapshot)
+
+
+def flush(m):
+    while len(m):
+        m.flush()
+
+
+def test_histogram():
+    histogram = Histogram()
+    for value in range(1, 1001):
+        histogram.record(value)
+
+    assert histogram.count == 1000
+    assert histogram.total == 500500
+    assert histogram.max == 1000
+    assert histogram.percentile(100) == 1000
+    assert histogram.percentile(0) == 1
+
+    # Within the precision of the buckets
+    for p in (10, 50, 90, 99):
+        assert 0.93 * p * 10 <= histogram.percentile(p) <= p * 10
+
+    other = Histogram()
+    other.record(5000)
+    histogram.merge(other)
+    assert histogram.count == 1001
+    assert histogram.max == 5000
+    assert histogram.percentile(100) == 5000
+
+
+def test_profile():
+    m = Manager()
+    App().register(m)
+    flush(m)
+
+    profiler = m.profile()
+    for _ in range(10):
+        m.fire(foo())
+    m.fire(bar())
+    flush(m)
+    while m._tasks:
+        m.tick()
+
+    snapshot = profiler.snapshot()
+    assert snapshot["sample"] == 1
+    assert snapshot["events"]["foo"] == 10
+    assert snapshot["events"]["bar"] == 1
+
+    handler = snapshot["handlers"]["App.foo"]
+    assert handler["count"] == 10
+    assert 0 <= handler["p50"] <= handler["max"] <= handler["total"]
+
+    assert snapshot["tasks"]["bar"]["count"] == 3
+    assert snapshot["queue"]["max"] == 11
+    assert snapshot["batch"]["count"] >= 1
+
+    m.profile(0)
+    m.fire(foo())
+    flush(m)
+    assert m._profiler is None
+    assert profiler.snapshot()["events"]["foo"] == 10
+
+
+def test_sample():
+    m = Manager()
+    App().register(m)
+    flush(m)
+
+    profiler = m.profile(sample=4)
+    for _ in range(20):
+        m.fire(foo())
+    flush(m)
+
+    snapshot = profiler.snapshot(reset=True)
+    assert snapshot["events"]["foo"] == 20
+    assert snapshot["handlers"]["App.foo"]["count"] == 5
+
+    assert profiler.snapshot()["events"] == {}
+
+
+def test_stats(manager, watcher):
+    app = App().register(manager)
+    assert watcher.wait("registered")
+
+    manager.profile(interval=0.1)
+    x = manager.fire(foo())
+    assert pytest.wait_for(x, "result")
+
+    assert watcher.wait("stats")
+    assert pytest.wait_for(app, "snapshots", lambda obj, attr: obj.snapshots)
+    assert app.snapshots[0]["sample"] == 1
+
+    manager.profile(0)
+    app.unregister()
+    assert watcher.wait("unregistered")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+from threading import Thread
+
+import pytest
+
+from circuits import Component, Event, Manager
+
+
+class foo(Event):
+
+    """foo Event"""
+
+
+class bar(Event):
+
+    """bar Event"""
+
+
+class App(Component):
+
+    def init(self):
+        self.results = []
+        self.watermarks = []
+        self.queued = 0
+
+    def foo(self, value):
+        self.results.append(value)
+        self.queued = max(self.queued, len(self.root))
+
+    def bar(self):
+        self.results.append("bar")
+
+    def queue_high(self, queued):
+        self.watermarks.append(("high", queued))
+
+    def queue_low(self, queued):
+        self.watermarks.append(("low", queued))
+
+
+def setup(*args, **kwargs):
+    m = Manager()
+    app = App().register(m)
+    while len(m):
+        m.flush()
+    m.limitQueue(*args, **kwargs)
+    return m, app
+
+
+def flush(m):
+    while len(m):
+        m.flush()
+
+
+def test_drop_newest():
+    m, app = setup(3, {foo: "drop_newest"})
+
+    values = [m.fire(foo(i)).event for i in range(5)]
+    assert len(m) == 3
+    assert [event.cancelled for event in values] == [False] * 3 + [True] * 2
+
+    flush(m)
+    assert app.results == [0, 1, 2]
+
+
+def test_drop_oldest():
+    m, app = setup(3, {"foo": "drop_oldest"})
+
+    m.fire(bar())
+    values = [m.fire(foo(i)).event for i in range(5)]
+
+    flush(m)
+    assert app.results == ["bar", 3, 4]
+    assert [event.cancelled for event in values] == [True] * 3 + [False] * 2
+
+
+def test_drop_oldest_none_queued():
+    m, app = setup(2, {"foo": "drop_oldest"})
+
+    m.fire(bar())
+    m.fire(bar())
+    x = m.fire(foo(0))
+
+    flush(m)
+    assert app.results == ["bar", "bar"]
+    assert x.event.cancelled
+
+
+def test_coalesce():
+    m, app = setup(2, {foo: "coalesce"})
+
+    m.fire(foo(0))
+    m.fire(bar())
+    for i in range(1, 5):
+        m.fire(foo(i))
+
+    flush(m)
+    assert app.results == [4, "bar"]
+
+
+def test_coalesce_priority():
+    m, app = setup(2, {foo: "coalesce"})
+
+    m.fire(bar())
+    m.fire(foo(0))
+    m.fire(foo(1), priority=-1)
+    m.fire(foo(2), priority=1)
+
+    flush(m)
+    assert app.results == [2, "bar"]
+
+
+def test_block():
+    m, app = setup(5)
+    m.start()
+
+    def produce():
+        for i in range(100):
+            m.fire(foo(i))
+
+    try:
+        producer = Thread(target=produce)
+        producer.start()
+        producer.join(30)
+
+        assert pytest.wait_for(app, "results", lambda app, attr: len(app.results) == 100)
+        assert app.results == list(range(100))
+        assert app.queued <= 5
+    finally:
+        m.stop()
+
+
+def test_watermarks():
+    m, app = setup(10, high=4, low=1)
+
+    for i in range(4):
+        m.fire(foo(i))
+    assert app.watermarks == []
+
+    flush(m)
+    assert app.watermarks == [("high", 4), ("low", 0)]
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+import os
+import signal
+from threading import Thread, current_thread
+
+import pytest
+
+from circuits import Component, Event, FlightRecorder
+from circuits.core import helpers
+from circuits.core.recorder import FIRED, HANDLED, MAGIC, RECORD
+from circuits.tools.trace import chain, handlers, load, slowest, waits
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO  # NOQA
+
+
+class foo(Event):
+
+    """foo Event"""
+
+
+class bar(Event):
+
+    """bar Event"""
+
+
+class fail(Event):
+
+    """fail Event"""
+
+
+class App(Component):
+
+    def foo(self):
+        self.fire(bar())
+
+    def bar(self):
+        return "bar"
+
+    def fail(self):
+        raise Exception("fail")
+
+
+def test_trace(manager, watcher, tmpdir):
+    path = str(tmpdir.join("circuits.trace"))
+    recorder = FlightRecorder(path, signo=None).register(manager)
+    app = App().register(manager)
+    assert pytest.wait_for(manager, "_recorder", recorder)
+
+    manager.fire(foo())
+    assert watcher.wait("bar")
+
+    assert recorder.dump() == path
+    with open(path, "rb") as f:
+        assert f.read().startswith(MAGIC)
+
+    trace = load(path)
+    assert trace.lost == 0
+
+    handled = [
+        r for r in trace.records if r.kind == HANDLED and "App" in r.handler
+    ]
+    foo_call = [r for r in handled if r.name == "foo"][0]
+    bar_call = [r for r in handled if r.name == "bar"][0]
+    assert "App.foo" in foo_call.handler
+    assert foo_call.channels == "*"
+    assert foo_call.time <= bar_call.time
+
+    # bar has been fired by App.foo while handling foo
+    fired = chain(trace, bar_call.event)
+    assert [r.name for r in fired[-2:]] == ["foo", "bar"]
+    assert fired[-1].kind == FIRED
+    assert fired[-1].cause == foo_call.event
+    assert "App.foo" in fired[-1].handler
+
+    summaries = handlers(trace)
+    assert summaries[foo_call.handler]["count"] == 1
+    assert summaries[bar_call.handler]["count"] == 1
+    assert waits(trace)["bar"]["count"] == 1
+    assert slowest(trace, 1)[0].kind == HANDLED
+
+    recorder.unregister()
+    app.unregister()
+    assert watcher.wait("unregistered")
+    assert manager._recorder is None
+
+
+def test_ring(manager, watcher, tmpdir):
+    path = str(tmpdir.join("circuits.trace"))
+    recorder = FlightRecorder(path, capacity=8, signo=None)
+    recorder.register(manager)
+    app = App().register(manager)
+    assert pytest.wait_for(manager, "_recorder", recorder)
+
+    for _ in range(10):
+        x = manager.fire(bar())
+        assert pytest.wait_for(x, "result")
+
+    recorder.dump()
+    trace = load(path)
+    assert len(trace.records) == 8
+    assert trace.lost == recorder._written - 8
+    assert [r.time for r in trace.records] == sorted(r.time for r in trace.records)
+    assert os.path.getsize(path) > 8 * RECORD.size
+
+    recorder.unregister()
+    app.unregister()
+    assert watcher.wait("unregistered")
+
+
+def test_dump_on_error(manager, watcher, tmpdir):
+    path = str(tmpdir.join("circuits.trace"))
+    recorder = FlightRecorder(path, signo=None).register(manager)
+    app = App().register(manager)
+    assert pytest.wait_for(manager, "_recorder", recorder)
+
+    manager.fire(fail())
+    assert watcher.wait("exception")
+    assert pytest.wait_for(path, None, lambda *args: os.path.exists(path))
+
+    recorder.unregister()
+    app.unregister()
+    assert watcher.wait("unregistered")
+
+
+def test_dump_on_error_traceback(monkeypatch, tmpdir):
+    stderr = StringIO()
+    monkeypatch.setattr(helpers, "stderr", stderr)
+
+    path = str(tmpdir.join("circuits.trace"))
+    recorder = FlightRecorder(path, signo=None)
+    app = App() + recorder
+    while len(app):
+        app.flush()
+
+    app.fire(fail())
+    while len(app):
+        app.flush()
+
+    # Recording doesn't replace the default exception handler
+    err = stderr.getvalue()
+    assert "Traceback (most recent call last)" in err
+    assert "Exception: fail" in err
+
+    recorder._writer.join(30)
+    assert os.path.exists(path)
+
+
+def test_dump_on_error_thread(monkeypatch, tmpdir):
+    path = str(tmpdir.join("circuits.trace"))
+    recorder = FlightRecorder(path, signo=None)
+    app = App() + recorder
+    while len(app):
+        app.flush()
+
+    writers = []
+    write = recorder._write
+
+    def _write(*args):
+        writers.append(current_thread())
+        write(*args)
+
+    monkeypatch.setattr(recorder, "_write", _write)
+    monkeypatch.setattr(helpers, "stderr", StringIO())
+
+    app.fire(fail())
+    while len(app):
+        app.flush()
+
+    # The file isn't written by the main loop
+    recorder._writer.join(30)
+    assert writers == [recorder._writer]
+    assert writers[0] is not current_thread()
+    assert load(path).records
+
+
+def test_threads(manager, watcher, tmpdir):
+    path = str(tmpdir.join("circuits.trace"))
+    recorder = FlightRecorder(path, signo=None).register(manager)
+    assert pytest.wait_for(manager, "_recorder", recorder)
+
+    def produce():
+        for _ in range(1000):
+            manager.fire(foo())
+
+    threads = [Thread(target=produce) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    trace = load(recorder.dump())
+    fired = [
+        r.event for r in trace.records if r.kind == FIRED and r.name == "foo"
+    ]
+    assert len(fired) == len(set(fired)) == 4000
+
+    recorder.unregister()
+    assert watcher.wait("unregistered")
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="No SIGUSR1")
+def test_dump_on_signal(tmpdir):
+    path = str(tmpdir.join("circuits.trace"))
+    previous = signal.getsignal(signal.SIGUSR1)
+
+    recorder = FlightRecorder(path)
+    app = App() + recorder
+    while len(app):
+        app.flush()
+    assert recorder._installed is app
+
+    os.kill(os.getpid(), signal.SIGUSR1)
+    assert os.path.exists(path)
+
+    recorder.unregister()
+    while len(app):
+        app.flush()
+    assert app._recorder is None
+    assert signal.getsignal(signal.SIGUSR1) == previous
@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+import pytest
+
+from circuits import Component, Event, Shards, ipc, shard
+from circuits.core.shards import findshard
+
+pytestmark = pytest.mark.skipif(pytest.PLATFORM == 'win32', reason='Unsupported Platform')
+
+
+class where(Event):
+    """where Event"""
+
+
+class relay(Event):
+    """relay Event"""
+
+
+class quit(Event):
+    """quit Event"""
+
+
+class App(Component):
+
+    channel = "app"
+
+    def init(self, index):
+        self.index = index
+
+    def where(self):
+        return self.index
+
+    def relay(self, key):
+        value = yield self.call(shard(where(), "app", key=key))
+        yield self.index, value.value
+
+    def quit(self):
+        self.root.stop()
+
+
+def factory(index):
+    return App(index)
+
+
+def test_findshard():
+    keys = ["channel-%d" % i for i in range(1000)]
+
+    assert set(findshard(key, 4) for key in keys) == set(range(4))
+    assert all(findshard(key, 1) == 0 for key in keys)
+    assert [findshard(key, 4) for key in keys] == [findshard(key, 4) for key in keys]
+
+    # Only the keys moving to the new shard change shards
+    moved = [key for key in keys if findshard(key, 4) != findshard(key, 5)]
+    assert all(findshard(key, 5) == 4 for key in moved)
+    assert len(moved) < len(keys) // 3
+
+
+def test_shards(manager, watcher):
+    shards = Shards(factory, 2).register(manager)
+    assert watcher.wait("shards_started")
+
+    keys = range(12)
+    assert set(findshard(key, 2) for key in keys) == set([0, 1])
+
+    for key in keys:
+        x = manager.fire(shard(where(), "app", key=key))
+        assert pytest.wait_for(x, "result")
+        assert x.value == findshard(key, 2)
+
+        # From shard 0 to the shard owning the key
+        x = manager.fire(ipc(relay(key), "app"), "shard-0")
+        assert pytest.wait_for(x, "result")
+        assert x.value == (0, findshard(key, 2))
+
+    for channel in ("shard-0", "shard-1"):
+        manager.fire(ipc(quit(), "app"), channel)
+
+    assert watcher.wait("shards_stopped")
+    assert not any(process.is_alive() for process in shards._processes)
+
+    shards.unregister()
+    assert watcher.wait("unregistered")
+
+
+def test_unregister(manager, watcher):
+    shards = Shards(factory, 2).register(manager)
+    assert watcher.wait("shards_started")
+
+    shards.unregister()
+    assert watcher.wait("unregistered")
+    assert not any(process.is_alive() for process in shards._processes)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+from time import time
+
+import pytest
+
+from circuits import Component, Event, sleep
+
+
+class nap(Event):
+
+    """nap Event"""
+
+    success = True
+
+
+class App(Component):
+
+    def init(self):
+        self.awake = False
+
+    def nap(self, seconds):
+        self.awake = False
+        yield sleep(seconds)
+        self.awake = True
+        yield "Good morning!"
+
+
+@pytest.fixture
+def app(request, manager, watcher):
+    app = App().register(manager)
+    assert watcher.wait("registered")
+
+    def finalizer():
+        app.unregister()
+
+    request.addfinalizer(finalizer)
+
+    return app
+
+
+def test_sleep(manager, watcher, app):
+    start = time()
+    x = manager.fire(nap(0.1))
+    assert watcher.wait("nap_success")
+
+    assert x.value == "Good morning!"
+    assert time() - start >= 0.1
+
+
+def test_parked(manager, watcher, app):
+    manager.fire(nap(60))
+
+    # The sleeping handler is not resumed until its deadline
+    assert pytest.wait_for(manager, "_timers", lambda m, attr: any(
+        not t[2].cancelled and t[2].when > time() + 30 for t in m._timers
+    ))
+    assert not manager._tasks
+    assert not app.awake
@@ -0,0 +1,82 @@
+"""Event Sources Tests"""
+from threading import Event as Flag
+from time import sleep, time
+
+from circuits import Component
+
+
+class Source(object):
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = []
+        self.flag = Flag()
+
+    def __call__(self, x):
+        self.calls.append((x, time()))
+        self.flag.set()
+        return self.delays.pop(0) if self.delays else None
+
+    def wait(self, n):
+        while len(self.calls) < n:
+            self.flag.clear()
+            if len(self.calls) < n and not self.flag.wait(5.0):
+                return False
+        return True
+
+
+def test_source(manager):
+    source = Source([0.05, 0.05])
+
+    handle = manager.addSource(source, 1)
+    assert source.wait(3)
+    assert [x for x, _ in source.calls] == [1, 1, 1]
+
+    times = [t for _, t in source.calls]
+    assert all(b - a >= 0.05 for a, b in zip(times, times[1:]))
+
+    # Not due until woken up
+    sleep(0.2)
+    assert len(source.calls) == 3
+    assert handle.when is None
+
+    start = time()
+    handle.wakeup()
+    assert source.wait(4)
+    assert source.calls[3][1] - start < 1.0
+
+    handle.remove()
+    handle.wakeup()
+    sleep(0.1)
+    assert len(source.calls) == 4
+    assert handle.removed
+
+
+def test_wakeup_earlier(manager):
+    source = Source([60])
+
+    handle = manager.addSource(source, 1)
+    assert source.wait(1)
+    assert handle.when > time() + 30
+
+    # Waking up later has no effect, earlier replaces the deadline
+    handle.wakeup(120)
+    assert handle.when < time() + 90
+    handle.wakeup(0.05)
+    assert source.wait(2)
+
+    handle.remove()
+
+
+def test_added_before_register(manager, watcher):
+    source = Source([0.05])
+
+    # Added to the component's own timers, moved to the root's ones
+    # on registration
+    app = Component()
+    app.addSource(source, 1)
+    app.register(manager)
+    assert watcher.wait("registered")
+
+    assert source.wait(2)
+    assert not app._timers
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+from threading import Thread
+
+import pytest
+
+from circuits import Component, Event, Manager
+
+
+class hello(Event):
+
+    """hello Event"""
+
+
+class App(Component):
+
+    def init(self):
+        self.received = []
+
+    def hello(self, producer, n):
+        self.received.append((producer, n))
+
+
+@pytest.fixture
+def app(request, manager, watcher):
+    app = App().register(manager)
+    assert watcher.wait("registered")
+
+    def finalizer():
+        app.unregister()
+
+    request.addfinalizer(finalizer)
+
+    return app
+
+
+def test_fire_from_threads(manager, watcher, app):
+    def produce(producer):
+        for n in range(1000):
+            app.fire(hello(producer, n))
+
+    threads = [Thread(target=produce, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert pytest.wait_for(app, "received", lambda a, attr: (
+        len(a.received) == 4000
+    ))
+
+    # Events of each producer are dispatched in order
+    for producer in range(4):
+        ns = [n for p, n in app.received if p == producer]
+        assert ns == list(range(1000))
+
+
+def test_inbox():
+    m = Manager()
+    app = App().register(m)
+    while len(m):
+        m.flush()
+
+    t = Thread(target=app.fire, args=(hello(0, 0),))
+    t.start()
+    t.join()
+
+    assert len(m) == 1
+    m.flush()
+    assert app.received == [(0, 0)]
@@ -85,3 +85,29 @@ def test_datetime(app, watcher):
     Timer(d, single()).register(app)
     assert watcher.wait("single_complete")
     assert app.flag
+
+
+def test_no_polling(app):
+    timer = Timer(60, single()).register(app)
+    assert "generate_events" not in timer._handlers
+    timer.unregister()
+
+
+def test_call_later(manager):
+    from threading import Event as Flag
+
+    flag = Flag()
+    results = []
+
+    def f(x):
+        results.append((x, time()))
+        flag.set()
+
+    start = time()
+    manager.callLater(0.1, f, 1)
+    handle = manager.callLater(0.05, f, 2)
+    handle.cancel()
+
+    assert flag.wait(5.0)
+    assert [x for x, _ in results] == [1]
+    assert results[0][1] - start >= 0.1
@@ -103,3 +103,31 @@ def test_findtype():
     a = findtype(app, A)
 
     assert isinstance(a, A)
+
+
+def test_find_index():
+    app = App()
+    a = A().register(app)
+    b = B().register(a)
+
+    while len(app):
+        app.flush()
+
+    assert findtype(app, Component, all=True)[0] is app
+    assert set(findtype(app, (A, B), all=True)) == {a, b}
+    assert findtype(a, Base) is None
+    assert findchannel(a, "b") is b
+    assert B not in app and B in a
+
+    a2 = A().register(b)
+    assert set(findchannel(app, "a", all=True)) == {a, a2}
+    assert findchannel(b, "a", all=True) == [a2]
+
+    b.unregister()
+    while len(app):
+        app.flush()
+
+    assert findchannel(app, "b") is None
+    assert findtype(app, A, all=True) == [a]
+    assert findtype(b, A) is a2
+    assert B not in a
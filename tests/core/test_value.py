@@ -21,6 +21,13 @@ class foo(Event):
     "foo Event"
 
 
+class quiet(Event):
+
+    "quiet Event"
+
+    forget = True
+
+
 class values(Event):
 
     "values Event"
@@ -39,6 +46,9 @@ class App(Component):
     def foo(self):
         raise Exception("ERROR")
 
+    def quiet(self):
+        return "Hello World!"
+
     @handler("hello_value_changed")
     def _on_hello_value_changed(self, value):
         self.value = value
@@ -137,3 +147,26 @@ def test_multiple_values(app, watcher):
     assert x[0] == "foo"
     assert x[1] == "bar"
     assert x[2] == "Hello World!"
+
+
+def test_forget(app, watcher):
+    x = app.fire(hello(), forget=True)
+    y = app.fire(hello(), forget=True)
+    assert watcher.wait("hello")
+
+    assert x is y
+    assert x.value is None
+    assert not x.result
+
+
+def test_forget_event(app, watcher):
+    x = app.fire(quiet())
+    assert watcher.wait("quiet")
+
+    assert x.value is None
+    assert not x.result
+
+    x = app.fire(quiet(), forget=False)
+    assert pytest.wait_for(x, "result")
+
+    assert x.value == "Hello World!"
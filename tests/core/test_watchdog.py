@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+from threading import Event as Flag
+
+import pytest
+
+from circuits import Component, Event, Watchdog
+
+
+class block(Event):
+
+    """block Event"""
+
+
+class slow_task(Event):
+
+    """slow_task Event"""
+
+
+class hello(Event):
+
+    """hello Event"""
+
+
+class App(Component):
+
+    def init(self):
+        self.reports = []
+        self.gate = Flag()
+
+    def block(self):
+        self.gate.wait(30)
+        return "done"
+
+    def hello(self):
+        return "Hello World!"
+
+    def slow_task(self):
+        yield
+        self.gate.wait(30)
+
+    def _pause(self):
+        self.gate.wait(30)
+
+    def slow_handler(self, handler, event, elapsed, stack):
+        self.reports.append((handler, event, elapsed, stack))
+
+
+def wait_slow(watchdog, name):
+    # The handler blocks until it has been found to be slow
+    return pytest.wait_for(
+        watchdog, "slow", lambda obj, attr: any(name in h for h in obj.slow)
+    )
+
+
+def wait_report(app, name):
+    assert pytest.wait_for(
+        app, "reports",
+        lambda obj, attr: any(name in r[0] for r in obj.reports)
+    )
+    return [r for r in app.reports if name in r[0]][0]
+
+
+def test_slow_handler(manager, watcher):
+    app = App().register(manager)
+    watchdog = Watchdog(0.05, 0.01).register(manager)
+    assert watcher.wait("registered")
+
+    x = manager.fire(hello())
+    assert pytest.wait_for(x, "result")
+    assert not any("App.hello" in h for h in watchdog.slow)
+
+    x = manager.fire(block())
+    assert wait_slow(watchdog, "App.block")
+    app.gate.set()
+    assert pytest.wait_for(x, "result")
+
+    handler, event, elapsed, stack = wait_report(app, "App.block")
+    assert event.name == "block"
+    assert elapsed > 0
+    assert any("in block" in frame for frame in stack)
+    assert watchdog.slow[handler] == 1
+
+    snapshot = watchdog.snapshot()
+    assert snapshot["slow"][handler] == 1
+    assert pytest.wait_for(
+        watchdog, "lag", lambda obj, attr: obj.snapshot()["lag"]["count"] > 0
+    )
+
+    watchdog.unregister()
+    app.unregister()
+    assert watcher.wait("unregistered")
+    assert watchdog._thread is None
+
+
+def test_slow_task_and_timer(manager, watcher):
+    app = App().register(manager)
+    watchdog = Watchdog(0.05, 0.01).register(manager)
+    assert watcher.wait("registered")
+
+    manager.fire(slow_task())
+    assert wait_slow(watchdog, "<task[slow_task]")
+    app.gate.set()
+
+    handler, event, elapsed, stack = wait_report(app, "<task[slow_task]")
+    assert handler == "<task[slow_task] (slow_task)>"
+    assert event.name == "slow_task"
+    assert elapsed > 0
+    assert any("in slow_task" in frame for frame in stack)
+
+    app.gate.clear()
+    manager.callLater(0, app._pause)
+    assert wait_slow(watchdog, "<timer")
+    app.gate.set()
+
+    handler, event, elapsed, stack = wait_report(app, "<timer")
+    assert handler == "<timer (App._pause)>"
+    assert event is None
+    assert any("in _pause" in frame for frame in stack)
+
+    watchdog.unregister()
+    app.unregister()
+    assert watcher.wait("unregistered")
@@ -0,0 +1,138 @@
+"""Workers Tests"""
+
+from threading import Event
+
+import pytest
+
+from circuits import Worker, task
+from circuits.core import TimeoutError
+from circuits.six.moves.queue import Full
+
+futures = pytest.importorskip("concurrent.futures")
+
+
+@pytest.fixture
+def gate(request):
+    gate = Event()
+    request.addfinalizer(gate.set)
+    return gate
+
+
+@pytest.fixture
+def worker(request, manager, watcher):
+    worker = Worker(
+        executor=True, workers=1, max_pending=2, overflow=request.param
+    ).register(manager)
+    assert watcher.wait("registered")
+
+    def finalizer():
+        worker.unregister()
+        assert watcher.wait("unregistered")
+
+    request.addfinalizer(finalizer)
+
+    return worker
+
+
+def add(a, b):
+    return a + b
+
+
+def err():
+    return x * 2  # NOQA
+
+
+def fire(worker, f, *args):
+    x = worker.fire(task(f, *args))
+
+    # Wait until the task has been accepted, rejected or done
+    assert pytest.wait_for(x, "errors", lambda x, attr: (
+        x.event.waitingHandlers or x.result or x.errors
+    ))
+    return x
+
+
+@pytest.mark.parametrize("worker", ["reject"], indirect=True)
+def test_success(manager, watcher, worker):
+    x = fire(worker, add, 1, 2)
+    assert pytest.wait_for(x, "result")
+
+    assert x.value == 3
+    assert worker.stats()["completed"] == 1
+
+
+@pytest.mark.parametrize("worker", ["reject"], indirect=True)
+def test_failure(manager, watcher, worker):
+    e = task(err)
+    e.failure = True
+    x = worker.fire(e)
+    assert watcher.wait("task_failure")
+
+    assert x.errors
+    assert isinstance(x.value[1], NameError)
+
+
+@pytest.mark.parametrize("worker", ["reject"], indirect=True)
+def test_reject(manager, watcher, worker, gate):
+    a = fire(worker, gate.wait)
+    b = fire(worker, gate.wait)
+    c = fire(worker, gate.wait)
+
+    assert c.errors
+    assert isinstance(c.value[1], Full)
+    assert worker.stats()["rejected"] == 1
+
+    gate.set()
+    assert pytest.wait_for(b, "result")
+    assert a.value is b.value is True
+
+
+@pytest.mark.parametrize("worker", ["block"], indirect=True)
+def test_block(manager, watcher, worker, gate):
+    fire(worker, gate.wait)
+    fire(worker, gate.wait)
+    c = fire(worker, add, 1, 2)
+
+    assert worker.stats()["pending"] == 2
+    assert worker.stats()["blocked"] == 1
+    assert not c.result
+
+    gate.set()
+    assert pytest.wait_for(c, "result")
+    assert c.value == 3
+    assert worker.stats()["blocked"] == 0
+
+
+@pytest.mark.parametrize("worker", ["drop"], indirect=True)
+def test_drop(manager, watcher, worker, gate):
+    a = fire(worker, gate.wait)
+    b = fire(worker, gate.wait)
+    c = fire(worker, add, 1, 2)
+
+    # The first task is running, the second is dropped
+    assert pytest.wait_for(b, "errors")
+    assert isinstance(b.value[1], futures.CancelledError)
+    assert worker.stats()["dropped"] == 1
+
+    gate.set()
+    assert pytest.wait_for(c, "result")
+    assert a.value is True
+    assert c.value == 3
+
+
+@pytest.mark.parametrize("worker", ["reject"], indirect=True)
+def test_timeout(manager, watcher, worker, gate):
+    a = fire(worker, gate.wait)
+    e = task(add, 1, 2)
+    e.timeout = 0.1
+    b = worker.fire(e)
+
+    # The queued task is cancelled at its deadline
+    assert pytest.wait_for(b, "errors")
+    assert isinstance(b.value[1], TimeoutError)
+    assert worker.stats()["timedout"] == 1
+    assert worker.stats()["pending"] == 1
+
+    gate.set()
+    assert pytest.wait_for(a, "result")
+    assert a.value is True
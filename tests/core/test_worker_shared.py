@@ -0,0 +1,56 @@
+"""Workers Tests"""
+
+import pytest
+
+from circuits import Worker, task
+
+pytest.importorskip("multiprocessing.shared_memory")
+
+
+@pytest.fixture
+def worker(request, manager, watcher):
+    worker = Worker(process=True, workers=2, shm_threshold=1024)
+    worker.register(manager)
+    assert watcher.wait("registered")
+
+    def finalizer():
+        worker.unregister()
+        assert watcher.wait("unregistered")
+
+    request.addfinalizer(finalizer)
+
+    return worker
+
+
+def reverse(data, suffix=b""):
+    return bytes(data[::-1]) + suffix
+
+
+def describe(data):
+    return type(data).__name__, len(data)
+
+
+def test_bytes(manager, watcher, worker):
+    data = b"abc" * 1000
+    x = worker.fire(task(reverse, data, suffix=data))
+    y = worker.fire(task(reverse, b"abc"))
+
+    assert pytest.wait_for(x, "result")
+    assert pytest.wait_for(y, "result")
+    assert x.value == data[::-1] + data
+    assert y.value == b"cba"
+
+    # Blocks are freed once no pending task refers to them
+    assert pytest.wait_for(worker, "_pending", {})
+    assert not worker._blocks
+
+
+def test_buffers(manager, watcher, worker):
+    data = bytearray(4096)
+    x = worker.fire(task(describe, data))
+    y = worker.fire(task(describe, memoryview(data)))
+
+    assert pytest.wait_for(x, "result")
+    assert pytest.wait_for(y, "result")
+    assert x.value == ("bytearray", 4096)
+    assert y.value == ("memoryview", 4096)
@@ -1,9 +1,12 @@
 """Workers Tests"""
 
 
+from threading import Event as Flag
+
 import pytest
 
-from circuits import Worker, task
+import circuits.core.manager
+from circuits import Component, Event, Worker, task
 
 task.complete = True
 
@@ -49,3 +52,53 @@ def test_args(manager, watcher, worker):
 
     assert x.result
     assert x.value == 3
+
+
+def test_parked(manager, watcher, worker):
+    gate = Flag()
+    x = manager.fire(task(gate.wait))
+
+    # The handler is not resumed before the pool is done
+    assert pytest.wait_for(x.event, "waitingHandlers", 1)
+    assert pytest.wait_for(manager, "_tasks", set())
+    assert not x.result
+
+    gate.set()
+    assert watcher.wait("task_complete")
+    assert x.value is True
+
+
+class roundtrip(Event):
+
+    """roundtrip Event"""
+
+
+class App(Component):
+
+    def init(self):
+        self.results = []
+        self.done = Flag()
+
+    def roundtrip(self):
+        value = yield self.call(task(add, 1, 2))
+        self.results.append(value.value)
+        self.done.set()
+
+
+def test_call_not_polled(monkeypatch, manager, watcher, worker):
+    app = App().register(manager)
+    assert watcher.wait("registered")
+
+    # Waiting tasks would only be resumed once a minute if polled
+    monkeypatch.setattr(circuits.core.manager, "TIMEOUT", 60)
+    try:
+        for _ in range(5):
+            app.done.clear()
+            manager.fire(roundtrip())
+            assert app.done.wait(10)
+    finally:
+        monkeypatch.undo()
+
+    assert app.results == [3] * 5
+
+    app.unregister()
@@ -66,3 +66,22 @@ def test_two_procs(manager, watcher):
 
     s2 = p2.stdout.getvalue()
     assert s2 == b"2\n"
+
+
+def test_no_polling(manager, watcher):
+    p = Process(["echo", "Hello World!"]).register(manager)
+    assert watcher.wait("registered")
+    assert "generate_events" not in p._handlers
+
+    p.start()
+    assert watcher.wait("terminated", p.channel)
+    assert p._source is None
+
+
+def test_start_before_register(manager, watcher):
+    p = Process(["echo", "Hello World!"])
+    p.start()
+    p.register(manager)
+
+    assert watcher.wait("terminated", p.channel)
+    assert p.stdout.getvalue() == b"Hello World!\n"
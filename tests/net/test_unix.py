@@ -8,6 +8,7 @@ import pytest
 from pytest import fixture
 
 from circuits import Manager
+from circuits.core.events import queue_high, queue_low
 from circuits.core.pollers import EPoll, KQueue, Poll, Select
 from circuits.net.sockets import UNIXClient, UNIXServer, close, connect, write
 
@@ -71,3 +72,50 @@ def test_unix(tmpfile, Poller):
         assert pytest.wait_for(server, "closed")
     finally:
         m.stop()
+
+
+def test_unix_queue_watermarks(tmpfile, Poller):
+    m = Manager() + Poller()
+
+    unix_server = UNIXServer(tmpfile)
+    unix_client = UNIXClient()
+    server = Server() + unix_server
+    client = Client() + unix_client
+
+    server.register(m)
+    client.register(m)
+
+    m.start()
+
+    try:
+        assert pytest.wait_for(server, "ready")
+        assert pytest.wait_for(client, "ready")
+
+        client.fire(connect(tmpfile))
+        assert pytest.wait_for(client, "connected")
+        assert pytest.wait_for(server, "connected")
+        assert pytest.wait_for(client, "data", b"Ready")
+
+        sockets = [unix_server._sock, unix_client._sock] + unix_server._clients
+
+        def reading(poller, attr):
+            return [poller.isReading(sock) for sock in sockets]
+
+        poller = unix_server._poller
+        m.fire(queue_high(0), "*")
+        assert pytest.wait_for(poller, None, lambda *args: not any(reading(*args)))
+
+        m.fire(queue_low(0), "*")
+        assert pytest.wait_for(poller, None, lambda *args: all(reading(*args)))
+
+        client.fire(write(b"foo"))
+        assert pytest.wait_for(server, "data", b"foo")
+
+        client.fire(close())
+        assert pytest.wait_for(client, "disconnected")
+        assert pytest.wait_for(server, "disconnected")
+
+        server.fire(close())
+        assert pytest.wait_for(server, "closed")
+    finally:
+        m.stop()